@@ -1,26 +1,54 @@
 import sys
-import operator
-from PySide6.QtCore import Qt
+
+if __name__ == '__main__' and '--batch' in sys.argv[1:]:
+    # Keystroke replay is headless, so dispatch before PySide6 is imported
+    from ryuu_core.calculator import batch_main
+    sys.exit(batch_main(sys.argv[1:]))
+
+if __name__ == '__main__' and '--stats' in sys.argv[1:]:
+    # So are statistics over a column of numbers
+    from ryuu_core.column_stats import stats_main
+    sys.exit(stats_main(sys.argv[1:]))
+
+from PySide6.QtCore import QElapsedTimer, Qt, QTimer
+from PySide6.QtGui import QKeySequence
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QLineEdit,
-    QPushButton, QGridLayout, QVBoxLayout, QHBoxLayout
+    QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QFileDialog,
+    QPushButton, QGridLayout, QVBoxLayout, QHBoxLayout, QComboBox
 )
 
+from eventmonitor import create_application, slot
+from ryuu_core.calculator import ARITHMETICS, KEYS, OPERATIONS, CalculatorState
+from theme import install_theme
+
+# Queued keyboard and paste input reaches the display at most once per frame
+FRAME_MS = 16
+# Only the tail of a longer number fits the display, and laying out the
+# whole string costs far more than a frame once it runs to many thousands
+DISPLAY_LIMIT = 256
+# Statistics over a pasted or opened column are read this many characters at
+# a time, for at most half a frame per event loop pass
+STATS_CHUNK_CHARS = 1 << 16
+
+# Keys whose event text is not the calculator key they stand for
+KEY_ALIASES = {
+    Qt.Key.Key_Return: '=',
+    Qt.Key.Key_Enter: '=',
+    Qt.Key.Key_Backspace: '⌫',
+    Qt.Key.Key_Escape: 'C',
+    Qt.Key.Key_Delete: 'C',
+}
+
 
-def safe_divide(a, b):
-    if b == 0:
-        return "Error"
-    return a / b
+def elide(text):
+    if len(text) > DISPLAY_LIMIT:
+        return '…' + text[1 - DISPLAY_LIMIT:]
+    return text
 
 
 class CalculatorUI(QMainWindow):
 
-    OPERATIONS = {
-        "÷": safe_divide,
-        "×": operator.mul,
-        "−": operator.sub,
-        "+": operator.add,
-    }
+    OPERATIONS = OPERATIONS
 
     def __init__(self):
         super().__init__()
@@ -28,9 +56,24 @@ class CalculatorUI(QMainWindow):
         self.setFixedSize(420, 640)
 
         # Calculator state
-        self.first_number = None
-        self.current_operator = None
-        self.reset_on_next_digit = False
+        self.state = CalculatorState()
+
+        # Typed and pasted keys wait here until the next frame
+        self.pending = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.flush_timer.timeout.connect(self.flush_input)
+        self.frame_clock = QElapsedTimer()
+        self.frame_clock.start()
+
+        # A statistics pass in progress: its ColumnStats, the text chunks
+        # still to read and the file they come from, if any
+        self.stats = None
+        self.stats_chunks = None
+        self.stats_file = None
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.statistics_step)
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -42,14 +85,29 @@ class CalculatorUI(QMainWindow):
         # Top area: small expression label + display
         self.expr_label = QLabel("")
         self.expr_label.setObjectName("expr")
+        self.expr_label.setProperty('role', 'muted')
+        self.expr_label.setIndent(8)
         self.expr_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
 
         self.display = QLineEdit("")
         self.display.setObjectName("display")
+        self.display.setProperty('role', 'display')
+        self.display.setTextMargins(20, 20, 20, 20)
+        self.display.setMinimumHeight(86)
         self.display.setReadOnly(True)
+        self.display.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.display.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
 
-        main_layout.addWidget(self.expr_label)
+        # Arithmetic backend, next to the expression label
+        self.arithmetic_box = QComboBox()
+        for name in ARITHMETICS:
+            self.arithmetic_box.addItem(name.capitalize(), name)
+        self.arithmetic_box.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+        top_row = QHBoxLayout()
+        top_row.addWidget(self.expr_label, 1)
+        top_row.addWidget(self.arithmetic_box)
+        main_layout.addLayout(top_row)
         main_layout.addWidget(self.display)
 
         # Button area
@@ -74,6 +132,9 @@ class CalculatorUI(QMainWindow):
                 btn = QPushButton(text)
                 btn.setObjectName('btn')
                 btn.setProperty('role', role)
+                btn.setMinimumSize(74, 64)
+                # Keep keyboard focus on the window, which handles typing
+                btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
                 self.buttons[text] = btn
                 # Make = span 2 columns
                 if text == '=':
@@ -89,7 +150,7 @@ class CalculatorUI(QMainWindow):
         footer.setFixedHeight(6)
         main_layout.addWidget(footer)
 
-        self.apply_styles()
+        install_theme(self)
 
     # Signal Connections
 
@@ -117,160 +178,253 @@ class CalculatorUI(QMainWindow):
         # Backspace
         self.buttons['⌫'].clicked.connect(self.backspace_pressed)
 
+        # Arithmetic backend
+        self.arithmetic_box.currentIndexChanged.connect(self.arithmetic_changed)
+
     # Slot Methods
 
+    @slot
     def number_pressed(self):
-        digit = self.sender().text()
-        if self.reset_on_next_digit:
-            self.display.clear()
-            self.reset_on_next_digit = False
-        current = self.display.text()
-        self.display.setText(current + digit)
+        self.flush_input()
+        self.state.number_pressed(self.sender().text())
+        self.refresh()
 
+    @slot
     def decimal_pressed(self):
-        current = self.display.text()
-        if '.' not in current:
-            self.display.setText(current + '.')
+        self.flush_input()
+        self.state.decimal_pressed()
+        self.refresh()
 
+    @slot
     def operator_pressed(self):
-        op = self.sender().text()
-        if self.display.text() == '' and self.first_number is None:
-            return
-        # If chaining operations, compute the intermediate result first
-        if self.first_number is not None and self.current_operator and not self.reset_on_next_digit:
-            self.equals_pressed()
-        if self.display.text():
-            self.first_number = float(self.display.text())
-        self.current_operator = op
-        self.expr_label.setText(f"{self.format_number(self.first_number)} {op}")
-        self.reset_on_next_digit = True
+        self.flush_input()
+        self.state.operator_pressed(self.sender().text())
+        self.refresh()
 
+    @slot
     def equals_pressed(self):
-        if self.first_number is None or self.current_operator is None:
-            return
-        if self.display.text() == '':
-            return
-        second = float(self.display.text())
-        result = self.OPERATIONS[self.current_operator](self.first_number, second)
-        if result == "Error":
-            self.expr_label.setText("Error: Division by zero")
-            self.display.clear()
-            self.first_number = None
-            self.current_operator = None
-            return
-        self.expr_label.setText(
-            f"{self.format_number(self.first_number)} {self.current_operator} {self.format_number(second)} ="
-        )
-        self.display.setText(self.format_number(result))
-        self.first_number = result
-        self.current_operator = None
-        self.reset_on_next_digit = True
+        self.flush_input()
+        self.state.equals_pressed()
+        self.refresh()
 
+    @slot
     def clear_pressed(self):
-        self.display.clear()
-        self.expr_label.clear()
-        self.first_number = None
-        self.current_operator = None
-        self.reset_on_next_digit = False
+        self.flush_input()
+        self.state.clear_pressed()
+        self.refresh()
 
+    @slot
     def negate_pressed(self):
-        current = self.display.text()
-        if current and current != '0':
-            if current.startswith('-'):
-                self.display.setText(current[1:])
-            else:
-                self.display.setText('-' + current)
+        self.flush_input()
+        self.state.negate_pressed()
+        self.refresh()
 
+    @slot
     def backspace_pressed(self):
-        current = self.display.text()
-        if current:
-            self.display.setText(current[:-1])
+        self.flush_input()
+        self.state.backspace_pressed()
+        self.refresh()
+
+    @slot
+    def arithmetic_changed(self, index):
+        self.flush_input()
+        self.state.set_arithmetic(ARITHMETICS[self.arithmetic_box.itemData(index)])
+        self.refresh()
+
+    def select_arithmetic(self, name):
+        """Switch to the ``ARITHMETICS`` backend ``name``; this clears the calculator."""
+        self.arithmetic_box.setCurrentIndex(self.arithmetic_box.findData(name))
+
+    @slot
+    def evaluate_expression(self, text):
+        """Evaluate a full expression such as ``3 × (4 − 2) ÷ 7`` and show the result."""
+        self.flush_input()
+        self.state.evaluate_expression(text)
+        self.refresh()
+
+    # Keyboard and clipboard input
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Paste):
+            self.paste(QApplication.clipboard().text())
+            return
+        if event.matches(QKeySequence.StandardKey.Open):
+            self.open_column()
+            return
+        key = KEY_ALIASES.get(event.key(), event.text())
+        if key in KEYS:
+            self.queue_input(key)
+        else:
+            super().keyPressEvent(event)
+
+    def paste(self, text):
+        """Enter pasted text as keystrokes, evaluate it if it is a full expression,
+        or compute statistics if it is a column of numbers."""
+        if not text.strip():
+            return
+        if '\n' in text:
+            # NumPy would add to every cold start, so the module is only
+            # imported once a multi-line paste arrives
+            from ryuu_core.column_stats import is_number_column
+            if is_number_column(text):
+                chunks = (text[start:start + STATS_CHUNK_CHARS]
+                          for start in range(0, len(text), STATS_CHUNK_CHARS))
+                self.start_statistics(chunks, column=True)
+                return
+        if all(char.isspace() for char in set(text) - KEYS):
+            self.queue_input(text)
+        else:
+            # Parentheses and the like only make sense as one expression
+            self.evaluate_expression(' '.join(text.split()))
+
+    def queue_input(self, keys):
+        self.pending.append(keys)
+        if not self.flush_timer.isActive():
+            # Input arriving within a frame of the last update waits for the
+            # next one; anything later is applied on the next event loop pass,
+            # after the rest of the burst has been queued too
+            self.flush_timer.start(max(0, FRAME_MS - self.frame_clock.elapsed()))
+
+    @slot
+    def flush_input(self):
+        """Apply all queued keys to the state in one step and update the display once."""
+        self.flush_timer.stop()
+        # Any other input ends a statistics pass still in progress
+        if self.stats is not None:
+            self.cancel_statistics()
+        if not self.pending:
+            return
+        keys = ''.join(self.pending)
+        self.pending.clear()
+        try:
+            self.state.feed(keys)
+        except ValueError:
+            # An operator after a bare '.' or '-'; later keys are dropped
+            self.state.expression = "Error: Invalid input"
+        self.refresh()
+
+    # Column statistics
+
+    @slot
+    def open_column(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open a column of numbers", "",
+            "Number files (*.txt *.csv);;All files (*)")
+        if path:
+            self.statistics_from_file(path)
+
+    def statistics_from_file(self, path):
+        from ryuu_core.column_stats import file_chunks
+        try:
+            file = open(path, encoding='utf-8')
+        except OSError as e:
+            self.flush_input()
+            self.show_statistics_error(e)
+            return
+        try:
+            # The first chunk tells whether this is a column, one number per line
+            chunks, column = file_chunks(file, STATS_CHUNK_CHARS)
+        except (OSError, UnicodeDecodeError) as e:
+            file.close()
+            self.flush_input()
+            self.show_statistics_error(e)
+            return
+        self.start_statistics(chunks, file, column)
+
+    def start_statistics(self, chunks, file=None, column=False):
+        """Compute statistics over text ``chunks`` a few at a time, between events.
+
+        With ``column`` the text has one number per line, and commas are
+        thousands separators.
+        """
+        from ryuu_core.column_stats import ColumnStats
+        self.flush_input()
+        self.stats = ColumnStats(column=column)
+        self.stats_chunks = chunks
+        self.stats_file = file
+        self.state.clear_pressed()
+        self.state.expression = "Reading numbers…"
+        self.refresh()
+        self.stats_timer.start(0)
+
+    @slot
+    def statistics_step(self):
+        stats = self.stats
+        clock = QElapsedTimer()
+        clock.start()
+        try:
+            while clock.elapsed() < FRAME_MS // 2:
+                chunk = next(self.stats_chunks, None)
+                if chunk is None:
+                    stats.finish()
+                    self.finish_statistics(stats)
+                    return
+                stats.feed(chunk)
+            # More to read; show the running total meanwhile
+            self.state.display = self.format_number(self.state.arithmetic.coerce(stats.sum))
+        except (OSError, ValueError, OverflowError) as e:
+            # ValueError includes UnicodeDecodeError; a sum past the float
+            # range has no exact value for coerce
+            self.stop_statistics()
+            self.show_statistics_error(e)
+            return
+        self.state.expression = f"Reading numbers… {stats.count:,}"
+        self.refresh()
+
+    def finish_statistics(self, stats):
+        self.stop_statistics()
+        if stats.count:
+            # The total stays on the display, ready for further calculation
+            self.state.show_result(self.state.arithmetic.coerce(stats.sum))
+        else:
+            self.state.display = ""
+        self.state.expression = stats.describe()
+        self.refresh()
+
+    def cancel_statistics(self):
+        # The partial total is no number to continue from
+        self.stop_statistics()
+        self.state.clear_pressed()
+        self.refresh()
+
+    def show_statistics_error(self, error):
+        self.state.clear_pressed()
+        if isinstance(error, UnicodeDecodeError):
+            self.state.expression = "Error: Not a text file"
+        elif isinstance(error, OSError):
+            self.state.expression = f"Error: {error.strerror or error}"
+        else:
+            self.state.expression = "Error: Sum out of range"
+        self.refresh()
+
+    def stop_statistics(self):
+        if self.stats is None:
+            return
+        self.stats_timer.stop()
+        if self.stats_file is not None:
+            self.stats_file.close()
+        self.stats = None
+        self.stats_chunks = None
+        self.stats_file = None
 
     # Helpers
 
+    def refresh(self):
+        # Push the state's text to the widgets, skipping unchanged ones
+        display = elide(self.state.display)
+        if self.display.text() != display:
+            self.display.setText(display)
+        expression = elide(self.state.expression)
+        if self.expr_label.text() != expression:
+            self.expr_label.setText(expression)
+        self.frame_clock.restart()
+
     def format_number(self, value):
-        """Display integers without .0 and floats normally."""
-        if isinstance(value, float) and value == int(value):
-            return str(int(value))
-        return str(value)
-
-    # Styles 
-
-    def apply_styles(self):
-        # Background
-        self.setStyleSheet("""
-        QMainWindow { background-color: #0f1114; }
-
-        /* Expression label */
-        QLabel#expr {
-            color: #bfbfc6;
-            font-size: 16px;
-            padding-left: 8px;
-        }
-
-        /* Display */
-        QLineEdit#display {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #1b1d20, stop:1 #111214);
-            color: #e6e6e6;
-            border: 1px solid #2b2d31;
-            border-radius: 6px;
-            padding: 20px;
-            font-size: 48px;
-            min-height: 86px;
-        }
-
-        /* Default button style */
-        QPushButton[role="normal"] {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #22242a, stop:1 #18191c);
-            color: #dcdce0;
-            border: 1px solid #2f3136;
-            border-radius: 8px;
-            font-size: 22px;
-            min-width: 74px;
-            min-height: 64px;
-        }
-        QPushButton[role="normal"]:hover {
-            background: #2b2d33;
-        }
-
-        /* Operator buttons (accent orange) */
-        QPushButton[role="op"] {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #2b2b2b, stop:1 #1f1f1f);
-            color: #f39c63;
-            border: 1px solid #3b3b3b;
-            border-radius: 8px;
-            font-weight: 600;
-            font-size: 22px;
-            min-width: 74px;
-            min-height: 64px;
-        }
-        QPushButton[role="op"]:hover {
-            background: #2f2f2f;
-        }
-
-        /* Equal button - match size and shape of other buttons, but with accent */
-        QPushButton[role="equal"] {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #b86b3a, stop:1 #8c4f2a);
-            color: white;
-            border: 1px solid #7a4a2a;
-            border-radius: 8px;
-            font-size: 22px;
-            font-weight: 700;
-            min-width: 74px;
-            min-height: 64px;
-        }
-        QPushButton[role="equal"]:hover {
-            background: #d07b45;
-        }
-        """)
+        return self.state.arithmetic.format(value)
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    app = create_application(sys.argv)
     w = CalculatorUI()
     w.show()
     sys.exit(app.exec())
@@ -1,79 +1,35 @@
-import json
+import os
 import sys
-from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout
+import threading
+import weakref
+from PySide6.QtCore import QObject, QThreadPool, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout
 
-def log(func):
-    def wrapper(*args, **kwargs):
-        log = func(*args, **kwargs)
-        print(f"[LOG] {func.__name__} called")
-        return log
-    return wrapper
+from eventmonitor import create_application, slot
+from ryuu_core.accounts import AccountModel
+from ryuu_core.instrumentation import timed
+from theme import install_theme
+
+
+class Model(AccountModel):
+    """The account model tied to a view, as this script has always offered it."""
 
-class Model:
     def __init__(self, view):
-        self.view = view
-        self.login_data = {}
-        self.filename = "TaskManagerLogin.json"
-        
-    @log
-    def save_user(self, username, password):
-        self.login_data["User Login"] = [username, password]
-        with open(self.filename, "w") as file:
-            json.dump(self.login_data, file)
-            return self.login_data["User Login"]
-
-    @log
-    def create_admin_login(self):
-        admin_username = "admin"
-        admin_password = "admin104"
-        self.login_data["Admin Login"] = [admin_username, admin_password]
-        with open(self.filename, "w") as file:
-            json.dump(self.login_data, file)
-            return self.login_data["Admin Login"]
-        
-    @log       
-    def load_user(self):
-        with open(self.filename, "r") as file:
-            self.login_data = json.load(file)
-            return self.login_data
-    
-    @log
-    def sign_up_button(self, username, password):
-        self.save_user(username, password)
-        if not username or not password:
-            return "Please enter a username and password"
-        self.save_user(username, password)
-        return username, password, "User created successfully"
-    
-    @log
-    def login_button(self, username, password):
-        self.load_user()
-        if "User Login" not in self.login_data:
-            return "No user found. Please sign up first."
-        stored_username, stored_password = self.login_data["User Login"]
-        if username == stored_username and password == stored_password:
-            return username, password, "Login successful"
-        else:
-            return "Invalid username or password"
-        
-    @log
-    def admin_login_button(self, username, password):
-        self.load_user()
-        if "Admin Login" not in self.login_data:
-            return "Admin login not found. Please create an admin login first."
-        stored_username, stored_password = self.login_data["Admin Login"]
-        if username == stored_username and password == stored_password:
-            return username, password, "Admin login successful"
-        else:
-            return "Invalid admin username or password"
-        
-    @log
+        super().__init__()
+        # Weak, so a background task holding the model cannot keep a closed
+        # window alive
+        self._view = weakref.ref(view)
+
+    @property
+    def view(self):
+        return self._view()
+
     def reset_inputs(self):
-        self.view.username_input.clear()
-        self.view.password_input.clear()
-        
-        
-        
+        view = self.view
+        if view is not None:
+            view.reset_inputs()
+
+
 class View(QWidget):
     def __init__(self):
         super().__init__()
@@ -109,49 +65,120 @@ class View(QWidget):
 
         container.setLayout(layout_vertical)
         self.setLayout(layout_vertical)
-            
+        install_theme(self)
+
+    @timed
+    def reset_inputs(self):
+        self.username_input.clear()
+        self.password_input.clear()
+        self.label_validation.clear()
+
+    def set_busy(self, busy):
+        for button in (self.button_signup, self.button_login, self.button_admin):
+            button.setEnabled(not busy)
+
+
+def create_model():
+    """The account model for this app: the shared authentication service when
+    ``RYUU_AUTH_SERVICE`` holds its address, the local files otherwise."""
+    address = os.environ.get("RYUU_AUTH_SERVICE")
+    if address:
+        # Imported here because asyncio and sockets add to every cold start
+        from ryuu_core.auth_service import RemoteAccountModel
+        return RemoteAccountModel(address)
+    return AccountModel()
+
+
+class WorkerSignals(QObject):
+    finished = Signal(object)
+
+
 class Controller:
-    def __init__(self, view):
+    def __init__(self, view, model=None):
         self.view = view
-        self.model = Model(view)
-        self.model.create_admin_login()
+        # The model never refers back to the view, so a background task that
+        # outlives a closed window keeps nothing of it alive
+        self.model = model if model is not None else AccountModel()
+        self.pool = QThreadPool.globalInstance()
+        # One long-lived signals object, owned by the GUI thread, carries
+        # every result back; the pool only ever holds plain callables
+        self.signals = WorkerSignals()
+        self.signals.finished.connect(self.show_result)
+        self.busy = False
+        self.admin_ready = threading.Event()
+        self.create_admin_login()
         self.setup_connections()
 
+    def create_admin_login(self):
+        # The first run hashes the admin password, so this goes to the pool
+        # too; requests wait there until it is done
+        model = self.model
+        ready = self.admin_ready
+        signals = self.signals
+
+        def task():
+            try:
+                model.create_admin_login()
+            except Exception as e:
+                signals.finished.emit(f"Error: {e}")
+            finally:
+                ready.set()
+
+        self.pool.start(task)
+
     def setup_connections(self):
         self.view.button_signup.clicked.connect(self.handle_signup)
         self.view.button_login.clicked.connect(self.handle_login)
         self.view.button_admin.clicked.connect(self.handle_admin_login)
 
+    @slot
     def handle_signup(self):
         username = self.view.username_input.text()
         password = self.view.password_input.text()
-        result = self.model.sign_up_button(username, password)
-        if isinstance(result, tuple):
-            self.view.label_validation.setText(result[2])
-        else:
-            self.view.label_validation.setText(result)
+        self.run_in_background(self.model.sign_up_button, username, password)
 
+    @slot
     def handle_login(self):
         username = self.view.username_input.text()
         password = self.view.password_input.text()
-        result = self.model.login_button(username, password)
-        if isinstance(result, tuple):
-            self.view.label_validation.setText(result[2])
-        else:
-            self.view.label_validation.setText(result)
+        self.run_in_background(self.model.login_button, username, password)
 
+    @slot
     def handle_admin_login(self):
         username = self.view.username_input.text()
         password = self.view.password_input.text()
-        result = self.model.admin_login_button(username, password)
+        self.run_in_background(self.model.admin_login_button, username, password)
+
+    def run_in_background(self, fn, username, password):
+        # Password hashing takes tens of milliseconds, so keep it off the GUI
+        # thread; the buttons stay disabled until the result arrives
+        self.busy = True
+        self.view.set_busy(True)
+        signals = self.signals
+        ready = self.admin_ready
+
+        def task():
+            ready.wait()
+            try:
+                result = fn(username, password)
+            except Exception as e:
+                result = f"Error: {e}"
+            signals.finished.emit(result)
+
+        self.pool.start(task)
+
+    @slot
+    def show_result(self, result):
+        self.busy = False
+        self.view.set_busy(False)
         if isinstance(result, tuple):
             self.view.label_validation.setText(result[2])
         else:
             self.view.label_validation.setText(result)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    app = create_application(sys.argv)
     view = View()
-    controller = Controller(view)
+    controller = Controller(view, create_model())
     view.show()
     sys.exit(app.exec())
@@ -1,61 +1,423 @@
+import os
+import sys
+import threading
+from functools import partial
+
+if __name__ == "__main__" and "--batch" in sys.argv[1:]:
+    # File processing is headless, so dispatch before PySide6 is imported
+    from ryuu_core.shape_stream import main
+    sys.exit(main(sys.argv[1:]))
+
+from PySide6.QtCore import (
+    QAbstractTableModel, QModelIndex, QObject, Qt, QThreadPool, QTimer, Signal
+)
 from PySide6.QtWidgets import (
-    QMainWindow, QApplication, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QWidget, QRadioButton, QGroupBox, QLineEdit, QFormLayout, QStackedWidget
+    QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QWidget, QRadioButton, QGroupBox, QLineEdit, QFormLayout, QStackedWidget,
+    QCheckBox, QFileDialog, QButtonGroup, QComboBox, QHeaderView, QTableView
 )
-from abc import ABC, abstractmethod
-import math
-
-class Shape(ABC):
-    @abstractmethod
-    def area(self):
-        pass
-    @abstractmethod
-    def perimeter(self):
-        pass
-
-class Rectangle(Shape):
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-    def area(self):
-        return self.width * self.height
-    def perimeter(self):
-        return 2 * (self.width + self.height)
-class Circle(Shape):
-    def __init__(self, radius):
-        self.radius = radius
-    def area(self):
-        return math.pi * self.radius ** 2
-    def perimeter(self):
-        return 2 * math.pi * self.radius
-class Triangle(Shape):
-    def __init__(self, side1, side2, side3):
-        self.side1 = side1
-        self.side2 = side2
-        self.side3 = side3
-    def area(self):
-        s = (self.side1 + self.side2 + self.side3) / 2
-        return math.sqrt(s * (s - self.side1) * (s - self.side2) * (s - self.side3))
-    def perimeter(self):
-        return self.side1 + self.side2 + self.side3
+
+from eventmonitor import create_application, slot
+from ryuu_core.shapes import SHAPES, form_shapes, load_plugins, measure
+from theme import install_theme
+
+# Results update once typing pauses for this long
+RECALC_DELAY_MS = 150
+# Rows the results table adds each time its view scrolls to the end
+FETCH_ROWS = 1024
+RESULT_HEADERS = ("#", "Shape", "Parameters", "Area", "Perimeter")
+
+class InputError(Exception):
+    """Raised by a page whose input cannot be calculated yet; the message is shown as is."""
 
 class InputWidget(QWidget):
-    def __init__(self, fields):  # fields: list of tuples (label, QLineEdit)
+    changed = Signal()
+
+    def __init__(self, shape_cls):  # one QLineEdit per entry of shape_cls.fields
         super().__init__()
+        self.shape_cls = shape_cls
         self.inputs = {}
+        # Parsed value of each field, or None while it is not a number;
+        # only the field that changed is parsed again
+        self.values = {}
         layout = QFormLayout()
-        for label in fields:
+        for label in shape_cls.fields:
             edit = QLineEdit()
+            edit.setObjectName(label)
+            edit.textChanged.connect(self.field_changed)
             self.inputs[label] = edit
+            self.values[label] = None
             layout.addRow(label + ":", edit)
         self.setLayout(layout)
 
+    def field_changed(self, text):
+        try:
+            value = float(text)
+        except ValueError:
+            value = None
+        self.values[self.sender().objectName()] = value
+        self.changed.emit()
+
+    def is_blank(self):
+        return not any(edit.text() for edit in self.inputs.values())
+
     def get_values(self):
         # Return dictionary {label: float_value}
+        if None in self.values.values():
+            return None
+        return dict(self.values)
+
+    def measure(self):
+        vals = self.get_values()
+        if vals is None:
+            raise InputError("Invalid input!")
+        # values follows the order of shape_cls.fields
+        return measure(self.shape_cls, *vals.values())
+
+class PolygonInput(QWidget):
+    """Loads a polygon outline from a vertex file; outlines are too big to type."""
+
+    changed = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.polygon = None
+        # (area, perimeter) of the loaded outline, by hull setting
+        self.results = {}
+        self.load_button = QPushButton("Load vertices...")
+        self.hull_check = QCheckBox("Convex hull")
+        self.source_label = QLabel("No outline loaded")
+        self.source_label.setWordWrap(True)
+        layout = QVBoxLayout()
+        layout.addWidget(self.load_button)
+        layout.addWidget(self.source_label)
+        layout.addWidget(self.hull_check)
+        layout.addStretch()
+        self.setLayout(layout)
+        self.load_button.clicked.connect(self.choose_file)
+        self.hull_check.toggled.connect(self.changed)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load polygon vertices", "",
+            "Vertex files (*.csv *.txt *.xy *.npy);;All files (*)")
+        if path:
+            self.load(path)
+
+    @slot
+    def load(self, path):
+        # NumPy is only needed once an outline is loaded, so keep it out of startup
+        from ryuu_core.polygon import Polygon
+        self.results.clear()
         try:
-            return {label: float(edit.text()) for label, edit in self.inputs.items()}
-        except ValueError:
+            self.polygon = Polygon.from_file(path)
+        except (OSError, ValueError) as e:
+            self.polygon = None
+            self.source_label.setText(f"Could not load {os.path.basename(path)}: {e}")
+        else:
+            self.source_label.setText(f"{os.path.basename(path)}: {len(self.polygon):,} vertices")
+        self.changed.emit()
+
+    def get_shape(self):
+        if self.polygon is None or not self.hull_check.isChecked():
+            return self.polygon
+        return self.polygon.convex_hull()
+
+    def is_blank(self):
+        return self.polygon is None
+
+    def measure(self):
+        if self.polygon is None:
+            raise InputError("Load a vertex file first")
+        hull = self.hull_check.isChecked()
+        if hull not in self.results:
+            shape = self.get_shape()
+            self.results[hull] = shape.area(), shape.perimeter()
+        return self.results[hull]
+
+# Shapes that are not entered as a form of numbers, with the page that takes
+# their input instead
+CUSTOM_PAGES = {
+    "polygon": PolygonInput,
+}
+
+class ResultModel(QAbstractTableModel):
+    """Table model over a ``ResultTable``.
+
+    ``rows`` holds the row numbers of the current sort and filter, or None
+    for every row in input order; no row data is ever copied.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.table = None
+        self.rows = None
+        self.fetched = 0
+
+    def set_table(self, table, rows=None):
+        self.beginResetModel()
+        self.table = table
+        self.rows = rows
+        self.fetched = min(FETCH_ROWS, self.available())
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        self.set_table(self.table, rows)
+
+    def available(self):
+        if self.table is None:
+            return 0
+        return len(self.table) if self.rows is None else len(self.rows)
+
+    def rows_appended(self):
+        # While the first screenful is still short, show new rows at once;
+        # later ones are fetched as the view scrolls to them
+        if self.fetched < FETCH_ROWS:
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RESULT_HEADERS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.fetched < self.available()
+
+    def fetchMore(self, parent):
+        count = min(FETCH_ROWS, self.available() - self.fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        column = index.column()
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if column != 1:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
             return None
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        table = self.table
+        row = index.row() if self.rows is None else int(self.rows[index.row()])
+        if column == 0:
+            return str(row + 1)
+        if column == 1:
+            return table.kind(row)
+        if column == 2:
+            return ", ".join(f"{value:g}" for value in table.parameters(row))
+        if not table.valid[row]:
+            return "Invalid"
+        value = table.areas[row] if column == 3 else table.perimeters[row]
+        return f"{value:.2f}"
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return RESULT_HEADERS[section]
+        return None
+
+class ResultSignals(QObject):
+    chunk = Signal(object)
+    loaded = Signal(object)
+    selected = Signal(object)
+    exported = Signal(str)
+
+class ResultsWindow(QWidget):
+    """Loads a shape list, computes it in the background and browses the results.
+
+    Loading, sorting and exporting run one at a time on a background thread
+    of the window's own, so the table stays responsive with millions of rows.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Bulk shape results")
+        self.resize(640, 480)
+        self.table = None
+        self.loading = False
+        # Loads and selections are numbered so results of superseded ones
+        # are dropped
+        self.generation = 0
+        self.selection = 0
+        self.cancel = threading.Event()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.signals = ResultSignals()
+        self.signals.chunk.connect(self.add_chunk)
+        self.signals.loaded.connect(self.load_finished)
+        self.signals.selected.connect(self.show_rows)
+        self.signals.exported.connect(self.show_status)
+
+        self.open_button = QPushButton("Open shape list...")
+        self.kind_filter = QComboBox()
+        self.kind_filter.addItem("All shapes", None)
+        for kind in SHAPES:
+            self.kind_filter.addItem(kind.capitalize(), kind)
+        self.export_button = QPushButton("Export CSV...")
+        self.status_label = QLabel("No shape list loaded")
+
+        self.model = ResultModel()
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.verticalHeader().hide()
+        # Fixed row heights let the view place rows without measuring any
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.view.horizontalHeader()
+        header.setStretchLastSection(True)
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.open_button)
+        controls.addWidget(self.kind_filter)
+        controls.addStretch()
+        controls.addWidget(self.export_button)
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        self.open_button.clicked.connect(self.choose_file)
+        self.export_button.clicked.connect(self.choose_export)
+        # Sorting is done here, off the GUI thread, rather than by the view
+        header.sortIndicatorChanged.connect(self.update_rows)
+        self.kind_filter.currentIndexChanged.connect(self.update_rows)
+        self.set_loading(False)
+        install_theme(self)
+
+    def set_loading(self, loading):
+        self.loading = loading
+        self.kind_filter.setEnabled(not loading and self.table is not None)
+        self.view.horizontalHeader().setSectionsClickable(not loading and self.table is not None)
+        self.export_button.setEnabled(not loading and self.table is not None)
+
+    def choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open shape list", "", "Shape files (*.csv *.bin);;All files (*)")
+        if path:
+            self.load(path)
+
+    @slot
+    def load(self, path):
+        # NumPy is only needed once a shape list is opened
+        from ryuu_core.shape_stream import compute_chunk, iter_records
+        from ryuu_core.shape_table import ResultTable
+        self.cancel.set()
+        self.cancel = cancel = threading.Event()
+        self.generation += 1
+        generation = self.generation
+        # Rows still being selected from the old table are dropped too
+        self.selection += 1
+        self.table = ResultTable()
+        self.set_loading(True)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.kind_filter.setCurrentIndex(0)
+        self.model.set_table(self.table)
+        self.status_label.setText(f"Loading {os.path.basename(path)}...")
+        signals = self.signals
+
+        def task():
+            error = None
+            try:
+                for codes, params in iter_records(path):
+                    if cancel.is_set():
+                        error = "cancelled"
+                        break
+                    signals.chunk.emit((generation, codes, params, *compute_chunk(codes, params)))
+            except (OSError, ValueError) as e:
+                error = str(e)
+            signals.loaded.emit((generation, path, error))
+
+        self.pool.start(task)
+
+    @slot
+    def add_chunk(self, chunk):
+        generation, *columns = chunk
+        if generation != self.generation:
+            return
+        self.table.append(*columns)
+        self.model.rows_appended()
+        self.status_label.setText(f"{len(self.table):,} shapes computed...")
+
+    @slot
+    def load_finished(self, result):
+        generation, path, error = result
+        if generation != self.generation:
+            return
+        self.set_loading(False)
+        name = os.path.basename(path)
+        if error:
+            self.status_label.setText(f"{name}: stopped after {len(self.table):,} shapes ({error})")
+        else:
+            invalid = len(self.table) - int(self.table.valid[:len(self.table)].sum())
+            self.status_label.setText(f"{name}: {len(self.table):,} shapes, {invalid:,} invalid")
+
+    @slot
+    def update_rows(self, *args):
+        from ryuu_core.shape_table import COLUMNS
+        if self.loading or self.table is None:
+            return
+        header = self.view.horizontalHeader()
+        section = header.sortIndicatorSection()
+        column = COLUMNS[section] if 0 <= section < len(COLUMNS) else None
+        descending = header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder
+        kind = self.kind_filter.currentData()
+        self.selection += 1
+        selection = self.selection
+        table = self.table
+        signals = self.signals
+
+        def task():
+            signals.selected.emit((selection, table.select(column, descending, kind)))
+
+        self.status_label.setText("Sorting...")
+        self.pool.start(task)
+
+    @slot
+    def show_rows(self, result):
+        selection, rows = result
+        if selection != self.selection:
+            return
+        self.model.set_rows(rows)
+        self.status_label.setText(f"{len(rows):,} of {len(self.table):,} shapes")
+
+    def choose_export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export results", "", "CSV files (*.csv)")
+        if path:
+            self.export(path)
+
+    @slot
+    def export(self, path):
+        table = self.table
+        rows = self.model.rows
+        signals = self.signals
+
+        def task():
+            # Written a chunk at a time, straight from the columns
+            try:
+                with open(path, "w", newline="") as out:
+                    table.write_csv(out, rows)
+            except OSError as e:
+                signals.exported.emit(f"Could not export: {e.strerror}")
+            else:
+                count = len(table) if rows is None else len(rows)
+                signals.exported.emit(f"Exported {count:,} shapes to {os.path.basename(path)}")
+
+        self.status_label.setText("Exporting...")
+        self.pool.start(task)
+
+    @slot
+    def show_status(self, text):
+        self.status_label.setText(text)
+
+    def closeEvent(self, event):
+        # Closing stops a load; the rows computed so far stay browsable
+        self.cancel.set()
+        super().closeEvent(event)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -63,30 +425,37 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Ryuu's Shape Calculator (refactored)")
 
         # --- Shape Selection ---
-        self.rectangle_radio = QRadioButton("Rectangle")
-        self.circle_radio = QRadioButton("Circle")
-        self.triangle_radio = QRadioButton("Triangle")
-        self.rectangle_radio.setChecked(True)
+        # One radio button per registered shape; a page for each is only
+        # built the first time its shape is selected
+        load_plugins()
+        self.page_factories = {}
+        self.shape_names = []
+        self.radios = {}
+        self.shape_buttons = QButtonGroup(self)
         radio_layout = QVBoxLayout()
-        radio_layout.addWidget(self.rectangle_radio)
-        radio_layout.addWidget(self.circle_radio)
-        radio_layout.addWidget(self.triangle_radio)
+        for name, shape_cls in form_shapes().items():
+            self.add_shape(name, shape_cls.__name__, partial(InputWidget, shape_cls), radio_layout)
+        for name, page_cls in CUSTOM_PAGES.items():
+            self.add_shape(name, name.capitalize(), page_cls, radio_layout)
+        self.radios[self.shape_names[0]].setChecked(True)
         self.shape_select_group = QGroupBox("Shape")
         self.shape_select_group.setLayout(radio_layout)
 
         # --- Inputs Widgets ---
-        self.rect_inputs = InputWidget(["Width", "Height"])
-        self.circle_inputs = InputWidget(["Radius"])
-        self.triangle_inputs = InputWidget(["Side 1", "Side 2", "Side 3"])
-
+        self.pages = {}
         self.stacked_inputs = QStackedWidget()
-        self.stacked_inputs.addWidget(self.rect_inputs)     # index 0
-        self.stacked_inputs.addWidget(self.circle_inputs)   # index 1
-        self.stacked_inputs.addWidget(self.triangle_inputs) # index 2
 
         # --- Calculate Button & Result ---
         self.calculate_button = QPushButton("Calculate")
         self.result_label = QLabel()
+        self.results_button = QPushButton("Bulk results...")
+        self.results_window = None
+
+        # Restarted by every edit, so a burst of typing recalculates once
+        self.recalc_timer = QTimer(self)
+        self.recalc_timer.setSingleShot(True)
+        self.recalc_timer.setInterval(RECALC_DELAY_MS)
+        self.recalc_timer.timeout.connect(self.recalculate)
 
         # --- Main Layout ---
         central = QWidget()
@@ -97,56 +466,90 @@ class MainWindow(QMainWindow):
         layout.addLayout(top_layout)
         layout.addWidget(self.calculate_button)
         layout.addWidget(self.result_label)
+        layout.addWidget(self.results_button)
         central.setLayout(layout)
         self.setCentralWidget(central)
 
         # --- Signals ---
-        self.rectangle_radio.toggled.connect(self.update_inputs)
-        self.circle_radio.toggled.connect(self.update_inputs)
-        self.triangle_radio.toggled.connect(self.update_inputs)
+        self.shape_buttons.idToggled.connect(self.shape_toggled)
         self.calculate_button.clicked.connect(self.on_calculate)
+        self.results_button.clicked.connect(self.show_results)
 
         self.update_inputs()
+        install_theme(self)
+
+    def add_shape(self, name, label, page_factory, radio_layout):
+        radio = QRadioButton(label)
+        self.shape_buttons.addButton(radio, len(self.shape_names))
+        radio_layout.addWidget(radio)
+        self.shape_names.append(name)
+        self.radios[name] = radio
+        self.page_factories[name] = page_factory
 
+    def input_page(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            page = self.page_factories[name]()
+            page.changed.connect(self.schedule_recalculate)
+            self.pages[name] = page
+            self.stacked_inputs.addWidget(page)
+        return page
+
+    def current_shape(self):
+        return self.shape_names[self.shape_buttons.checkedId()]
+
+    def select_shape(self, name):
+        self.radios[name].setChecked(True)
+
+    def shape_toggled(self, button_id, checked):
+        # Switching unchecks one button and checks another; act once
+        if checked:
+            self.update_inputs()
+
+    @slot
     def update_inputs(self):
-        if self.rectangle_radio.isChecked():
-            self.stacked_inputs.setCurrentIndex(0)
-        elif self.circle_radio.isChecked():
-            self.stacked_inputs.setCurrentIndex(1)
-        elif self.triangle_radio.isChecked():
-            self.stacked_inputs.setCurrentIndex(2)
+        self.stacked_inputs.setCurrentWidget(self.input_page(self.current_shape()))
+        # Results are memoized, so coming back to a shape shows its result at once
+        self.recalculate()
+
+    def schedule_recalculate(self):
+        # Connecting page.changed straight to recalc_timer.start would be
+        # simpler, but PySide keeps memory for every Python signal connected
+        # to another object's C++ slot, even after both are deleted
+        self.recalc_timer.start()
 
+    @slot
+    def recalculate(self):
+        # Live updates stay quiet about pages nobody has filled in yet
+        if self.stacked_inputs.currentWidget().is_blank():
+            self.result_label.clear()
+        else:
+            self.on_calculate()
+
+    @slot
+    def show_results(self):
+        # Built on first use; it keeps its table while hidden
+        if self.results_window is None:
+            self.results_window = ResultsWindow()
+        self.results_window.show()
+        self.results_window.raise_()
+        self.results_window.activateWindow()
+        return self.results_window
+
+    @slot
     def on_calculate(self):
-        if self.rectangle_radio.isChecked():
-            vals = self.rect_inputs.get_values()
-            if vals:
-                shape = Rectangle(vals["Width"], vals["Height"])
-            else:
-                self.result_label.setText("Invalid input!")
-                return
-        elif self.circle_radio.isChecked():
-            vals = self.circle_inputs.get_values()
-            if vals:
-                shape = Circle(vals["Radius"])
-            else:
-                self.result_label.setText("Invalid input!")
-                return
-        elif self.triangle_radio.isChecked():
-            vals = self.triangle_inputs.get_values()
-            if vals:
-                shape = Triangle(vals["Side 1"], vals["Side 2"], vals["Side 3"])
-            else:
-                self.result_label.setText("Invalid input!")
-                return
+        self.recalc_timer.stop()
+        page = self.input_page(self.current_shape())
         try:
-            area = shape.area()
-            peri = shape.perimeter()
+            area, peri = page.measure()
             self.result_label.setText(f"Area: {area:.2f}   Perimeter: {peri:.2f}")
+        except InputError as e:
+            self.result_label.setText(str(e))
         except Exception as e:
             self.result_label.setText("Invalid values for calculation")
 
 if __name__ == "__main__":
-    app = QApplication([])
+    app = create_application([])
     window = MainWindow()
     window.show()
-    app.exec()
\ No newline at end of file
+    app.exec()
@@ -0,0 +1,188 @@
+"""Memory check for repeatedly opening and closing the app windows.
+
+Each cycle builds an app's window offscreen, uses it briefly, closes it and
+lets Qt delete it. After the warm-up cycles have filled caches and done any
+lazy imports, every further cycle should leave nothing behind. The script
+reports what each cycle retains:
+
+* traced Python memory (tracemalloc), with the source lines that grew
+* objects tracked by the garbage collector, with the types that grew
+* process RSS (Linux only), which also covers Qt's C++ side
+
+and exits with status 1 if any app retains more than ``--max-bytes`` or
+``--max-objects`` per cycle.
+
+    python benchmarks/bench_memory.py [--cycles 200] [--warmup 10] [apps...]
+
+PySide's own caches still grow by a fixed amount after warm-up, a few tens
+of KB in all. Spread over enough cycles that stays far below the limits,
+while a real leak costs the same on every cycle.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication, QEvent  # noqa: E402
+from PySide6.QtGui import QPixmapCache  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from launcher import load_script  # noqa: E402
+
+
+# One open/use/close cycle per app
+
+def calculator_cycle(module):
+    window = module.CalculatorUI()
+    window.show()
+    for key in "12+34=":
+        window.buttons[key].click()
+    window.paste("7×(8−2)")
+    window.paste("99+1=")
+    window.flush_input()
+    window.close()
+    window.deleteLater()
+
+
+def login_cycle(module):
+    view = module.View()
+    controller = module.Controller(view)
+    view.show()
+    view.username_input.setText("admin")
+    view.password_input.setText("admin104")
+    controller.handle_admin_login()
+    while controller.busy:
+        QCoreApplication.processEvents()
+    view.close()
+    view.deleteLater()
+
+
+def shapes_cycle(module):
+    window = module.MainWindow()
+    window.show()
+    for name, values in (("rectangle", ("3", "4")), ("circle", ("2",)), ("triangle", ("3", "4", "5"))):
+        window.select_shape(name)
+        page = window.input_page(name)
+        for edit, text in zip(page.inputs.values(), values):
+            edit.setText(text)
+        window.on_calculate()
+    window.close()
+    window.deleteLater()
+
+
+APPS = {
+    "calculator": ("Calculator_Ryuu.py", calculator_cycle),
+    "login": ("Login.py", login_cycle),
+    "shapes": ("PySide Shape Calc.py", shapes_cycle),
+}
+
+
+def settle():
+    # What the event loop would do between cycles: deliver queued events,
+    # run deferred deletes, then collect Python cycles
+    QCoreApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    gc.collect()
+    # The Fusion style caches rendered button pixmaps, up to 10 MB, which
+    # would otherwise show up as RSS growth
+    QPixmapCache.clear()
+
+
+def rss():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def object_counts():
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+def run(cycle, module, cycles, warmup):
+    def cycles_run():
+        for _ in range(cycles):
+            cycle(module)
+            settle()
+
+    for _ in range(warmup):
+        cycle(module)
+        settle()
+
+    # Objects and RSS are counted in a pass of their own, since tracemalloc
+    # snapshots are full of tuples of their own
+    objects_before = object_counts()
+    rss_before = rss()
+    cycles_run()
+    rss_after = rss()
+    objects_after = object_counts()
+
+    tracemalloc.start(10)
+    before = tracemalloc.take_snapshot()
+    cycles_run()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    lines = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+
+    return {
+        "bytes": sum(stat.size_diff for stat in lines) / cycles,
+        # Less the one Counter made by the first count
+        "objects": (sum(objects_after.values()) - sum(objects_before.values()) - 1) / cycles,
+        "rss": None if rss_before is None else (rss_after - rss_before) / cycles,
+        "types": (objects_after - objects_before).most_common(8),
+        "lines": [stat for stat in lines if stat.size_diff > 0][:8],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--max-bytes", type=float, default=1024,
+                        help="traced Python bytes a cycle may retain (default 1024)")
+    parser.add_argument("--max-objects", type=float, default=1,
+                        help="gc-tracked objects a cycle may retain (default 1)")
+    parser.add_argument("apps", nargs="*", help=f"any of {', '.join(APPS)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.apps) - set(APPS)
+    if unknown:
+        parser.error(f"unknown app: {', '.join(sorted(unknown))}")
+
+    app = QApplication.instance() or QApplication([])
+    failed = False
+    print(f"{'app':<12} {'bytes/cycle':>12} {'objects/cycle':>14} {'RSS KiB/cycle':>14}  result")
+    # The Login app keeps its credential files in the working directory
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for name in args.apps or APPS:
+            script, cycle = APPS[name]
+            result = run(cycle, load_script(script), args.cycles, args.warmup)
+            ok = result["bytes"] <= args.max_bytes and result["objects"] <= args.max_objects
+            rss_growth = "n/a" if result["rss"] is None else f"{result['rss'] / 1024:.1f}"
+            print(f"{name:<12} {result['bytes']:>12.0f} {result['objects']:>14.1f} "
+                  f"{rss_growth:>14}  {'ok' if ok else 'LEAK'}")
+            if not ok:
+                failed = True
+                for type_name, count in result["types"]:
+                    print(f"    +{count / args.cycles:.1f}/cycle {type_name}")
+                for stat in result["lines"]:
+                    frame = stat.traceback[0]
+                    print(f"    +{stat.size_diff / args.cycles:.0f} B/cycle "
+                          f"{frame.filename}:{frame.lineno}")
+        os.chdir(ROOT)
+    del app
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
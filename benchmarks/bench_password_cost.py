@@ -0,0 +1,66 @@
+"""Report scrypt cost against hashing latency and GUI-thread stalls.
+
+For each cost ``n`` this measures how long one hash takes, and how long the
+longest gap is in a 1 ms tick loop on the main thread while a worker thread
+hashes, i.e. what a Qt event loop would see. Pick the largest ``n`` whose
+stall stays well under the 16 ms frame budget and set ``SCRYPT_N`` to it.
+
+    python benchmarks/bench_password_cost.py [--repeat 5] [--min-log2 10] [--max-log2 17]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ryuu_core.passwords import SCRYPT_N, hash_password
+
+FRAME_BUDGET_MS = 16.0
+
+
+def hash_latency_ms(n, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hash_password("correct horse battery staple", n=n)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def worst_tick_gap_ms(n):
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (hash_password("benchmark", n=n), done.set()))
+    last = time.perf_counter()
+    worst = 0.0
+    worker.start()
+    while not done.is_set():
+        time.sleep(0.001)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    worker.join()
+    return worst * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-log2", type=int, default=10)
+    parser.add_argument("--max-log2", type=int, default=17)
+    args = parser.parse_args()
+
+    print(f"{'n':>8} {'hash ms':>9} {'gui stall ms':>13}  within frame")
+    for log2_n in range(args.min_log2, args.max_log2 + 1):
+        n = 2 ** log2_n
+        latency = hash_latency_ms(n, args.repeat)
+        stall = worst_tick_gap_ms(n)
+        marker = " (current)" if n == SCRYPT_N else ""
+        within = "yes" if stall < FRAME_BUDGET_MS else "NO"
+        print(f"{n:>8} {latency:>9.1f} {stall:>13.1f}  {within}{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cold-start benchmark for the three apps.
+
+Each run starts a fresh interpreter under ``QT_QPA_PLATFORM=offscreen`` and
+reports, in milliseconds:
+
+* import: loading the app script, PySide6 included
+* construct: creating the app's ``QApplication`` and its main window
+* first frame: from ``show()`` until the window's first paint event
+* total: from interpreter launch, as seen by this process, to first paint
+
+    python benchmarks/bench_startup.py [--runs 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script, and the code that builds its main window as ``window``
+APPS = {
+    "calculator": ("Calculator_Ryuu.py", "window = module.CalculatorUI()"),
+    "login": ("Login.py", "window = module.View()\ncontroller = module.Controller(window)"),
+    "shapes": ("PySide Shape Calc.py", "window = module.MainWindow()"),
+}
+
+# Runs inside the child interpreter; prints one JSON line of timings
+PROBE = r"""
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+
+app = module.create_application([])
+exec(sys.argv[2])
+constructed = time.perf_counter()
+
+class FirstPaint(QObject):
+    painted = None
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self.painted is None:
+            self.painted = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+probe = FirstPaint()
+window.installEventFilter(probe)
+shown = time.perf_counter()
+window.show()
+QTimer.singleShot(5000, app.quit)
+app.exec()
+print(json.dumps({
+    "import": (imported - start) * 1000,
+    "construct": (constructed - imported) * 1000,
+    "first_frame": ((probe.painted or time.perf_counter()) - shown) * 1000,
+    "painted": probe.painted is not None,
+}))
+"""
+
+
+def run_once(script, construct, workdir):
+    # Run from a scratch directory so the Login app's credential files stay
+    # out of the repository
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    launched = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, os.path.join(ROOT, script), construct],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    finished = time.perf_counter()
+    timings = json.loads(output.strip().splitlines()[-1])
+    # The child exits right after its first frame, so launch-to-exit
+    # slightly overstates launch-to-first-frame
+    timings["total"] = (finished - launched) * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="also write the medians to this file")
+    parser.add_argument("apps", nargs="*", help=f"any of {', '.join(APPS)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.apps) - set(APPS)
+    if unknown:
+        parser.error(f"unknown app: {', '.join(sorted(unknown))}")
+
+    results = {}
+    print(f"{'app':<12} {'import':>8} {'construct':>10} {'first frame':>12} {'total':>8}  (median ms)")
+    for name in args.apps or APPS:
+        with tempfile.TemporaryDirectory() as workdir:
+            runs = [run_once(*APPS[name], workdir) for _ in range(args.runs)]
+        if not all(run["painted"] for run in runs):
+            print(f"{name}: window never painted", file=sys.stderr)
+        medians = {key: statistics.median(run[key] for run in runs)
+                   for key in ("import", "construct", "first_frame", "total")}
+        results[name] = medians
+        print(f"{name:<12} {medians['import']:>8.1f} {medians['construct']:>10.1f} "
+              f"{medians['first_frame']:>12.1f} {medians['total']:>8.1f}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Window construction and theme-switch time, per-window QSS versus ``theme``.
+
+``legacy`` reproduces how CalculatorUI used to style itself: every window
+set the full gradient stylesheet, and switching themes meant setting a
+recoloured copy on every window. ``theme`` uses the shared palette-based
+theme module. Each mode runs in its own offscreen interpreter.
+
+    python benchmarks/bench_theme.py [--windows 10] [--switches 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The stylesheet CalculatorUI.apply_styles used to set on each window
+LEGACY_QSS = """
+QMainWindow { background-color: #0f1114; }
+
+/* Expression label */
+QLabel#expr {
+    color: #bfbfc6;
+    font-size: 16px;
+    padding-left: 8px;
+}
+
+/* Display */
+QLineEdit#display {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                stop:0 #1b1d20, stop:1 #111214);
+    color: #e6e6e6;
+    border: 1px solid #2b2d31;
+    border-radius: 6px;
+    padding: 20px;
+    font-size: 48px;
+    min-height: 86px;
+}
+
+/* Default button style */
+QPushButton[role="normal"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                stop:0 #22242a, stop:1 #18191c);
+    color: #dcdce0;
+    border: 1px solid #2f3136;
+    border-radius: 8px;
+    font-size: 22px;
+    min-width: 74px;
+    min-height: 64px;
+}
+QPushButton[role="normal"]:hover {
+    background: #2b2d33;
+}
+
+/* Operator buttons (accent orange) */
+QPushButton[role="op"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                stop:0 #2b2b2b, stop:1 #1f1f1f);
+    color: #f39c63;
+    border: 1px solid #3b3b3b;
+    border-radius: 8px;
+    font-weight: 600;
+    font-size: 22px;
+    min-width: 74px;
+    min-height: 64px;
+}
+QPushButton[role="op"]:hover {
+    background: #2f2f2f;
+}
+
+/* Equal button - match size and shape of other buttons, but with accent */
+QPushButton[role="equal"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                stop:0 #b86b3a, stop:1 #8c4f2a);
+    color: white;
+    border: 1px solid #7a4a2a;
+    border-radius: 8px;
+    font-size: 22px;
+    font-weight: 700;
+    min-width: 74px;
+    min-height: 64px;
+}
+QPushButton[role="equal"]:hover {
+    background: #d07b45;
+}
+"""
+
+# Colours swapped to produce the legacy "light" variant
+LEGACY_LIGHT = {"#0f1114": "#f4f4f6", "#e6e6e6": "#1b1d20", "#1b1d20": "#ffffff",
+                "#111214": "#f0f0f2", "#22242a": "#e6e7ea", "#18191c": "#dcdde0"}
+
+
+def legacy_light():
+    qss = LEGACY_QSS
+    for old, new in LEGACY_LIGHT.items():
+        qss = qss.replace(old, new)
+    return qss
+
+
+def measure(mode, windows, switches):
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PySide6.QtWidgets import QApplication
+
+    import Calculator_Ryuu
+    import theme
+
+    app = QApplication([])
+    if mode == "legacy":
+        Calculator_Ryuu.install_theme = lambda window: window.setStyleSheet(LEGACY_QSS)
+
+    built = []
+    construct = []
+    for _ in range(windows):
+        start = time.perf_counter()
+        window = Calculator_Ryuu.CalculatorUI()
+        window.show()
+        app.processEvents()
+        construct.append((time.perf_counter() - start) * 1000)
+        built.append(window)
+
+    sheets = [legacy_light(), LEGACY_QSS]
+    names = ["light", "dark"]
+    switch = []
+    for index in range(switches):
+        start = time.perf_counter()
+        if mode == "legacy":
+            for window in built:
+                window.setStyleSheet(sheets[index % 2])
+        else:
+            theme.apply_theme(names[index % 2])
+        app.processEvents()
+        switch.append((time.perf_counter() - start) * 1000)
+    return {
+        "first_window": construct[0],
+        "next_windows": statistics.median(construct[1:] or construct),
+        "switch": statistics.median(switch),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=10)
+    parser.add_argument("--switches", type=int, default=20)
+    parser.add_argument("--mode", choices=["legacy", "theme"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.windows, args.switches)))
+        return
+
+    print(f"{'mode':<8} {'first window':>13} {'next windows':>13} {'theme switch':>13}  (ms)")
+    for mode in ("legacy", "theme"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--windows", str(args.windows), "--switches", str(args.switches)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<8} {result['first_window']:>13.1f} {result['next_windows']:>13.1f} "
+              f"{result['switch']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
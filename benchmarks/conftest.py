@@ -0,0 +1,142 @@
+"""Offscreen performance suite for the three apps.
+
+Run with ``python -m pytest benchmarks``. Every benchmark records its median
+and fastest latency and the peak Python memory of one traced call, and fails
+any benchmark whose fastest latency or peak memory exceeds ``baseline.json``
+by more than ``--regression-tolerance`` (25% by default). Other load on the
+machine only ever slows rounds down, so the fastest round is the steady
+number to compare; the median is kept for reading. A busy machine can still
+slow a whole stretch of the run, so a benchmark that looks slower is timed
+again, after a pause, before it fails.
+
+The committed ``baseline.json`` holds the slowest of three runs on a
+single-core machine. Timings depend on the hardware, so a machine that runs
+the suite regularly (CI included) should first write its own with
+``--save-baseline`` and compare against that. Update the committed file
+whenever a change is meant to move the numbers.
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Further timings of a benchmark that looked slower, and the pause before each
+RECHECKS = 3
+RECHECK_PAUSE_S = 0.5
+# Time spent on one recheck once it has run at least one round
+RECHECK_TIME_S = 1.0
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("baseline")
+    group.addoption("--save-baseline", action="store_true",
+                    help=f"write this run's results to {BASELINE}")
+    group.addoption("--regression-tolerance", type=float, default=0.25,
+                    help="allowed slowdown or memory growth over the baseline (0.25 = 25%%)")
+
+
+class Baseline:
+
+    def __init__(self, config):
+        self.save = config.getoption("--save-baseline")
+        self.tolerance = config.getoption("--regression-tolerance")
+        self.results = {}
+        self.reference = {}
+        if os.path.exists(BASELINE) and not self.save:
+            with open(BASELINE) as file:
+                self.reference = json.load(file)
+
+    def is_slower(self, name, fastest):
+        reference = self.reference.get(name)
+        return reference is not None and fastest > reference["min_s"] * (1 + self.tolerance)
+
+    def check(self, name, median, fastest, peak):
+        self.results[name] = {"median_s": median, "min_s": fastest, "peak_bytes": peak}
+        reference = self.reference.get(name)
+        if reference is None:
+            return
+        limit = 1 + self.tolerance
+        if self.is_slower(name, fastest):
+            pytest.fail(f"fastest round {fastest * 1000:.3f} ms regressed from "
+                        f"{reference['min_s'] * 1000:.3f} ms")
+        # Absolute slack so small allocations that depend on cache state do
+        # not flap
+        if peak > reference["peak_bytes"] * limit + 16384:
+            pytest.fail(f"peak memory {peak} B regressed from {reference['peak_bytes']} B")
+
+    def write(self):
+        with open(BASELINE, "w") as file:
+            json.dump(self.results, file, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    result = Baseline(request.config)
+    yield result
+    if result.save and result.results:
+        result.write()
+
+
+@pytest.fixture
+def perf(benchmark, baseline, request):
+    """Benchmark ``fn`` and check it against the baseline.
+
+    ``interactions`` is how many user interactions one call performs, used
+    to report per-interaction latency.
+    """
+    def run(fn, *args, interactions=1, rounds=None):
+        # Lazy imports and cache fills happen once per process, in whichever
+        # test runs first, so they are kept out of the traced call
+        fn(*args)
+        tracemalloc.start()
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if rounds is None:
+            result = benchmark(fn, *args)
+        else:
+            result = benchmark.pedantic(fn, args=args, rounds=rounds)
+        benchmark.extra_info["peak_kib"] = peak / 1024
+        if benchmark.stats is not None:
+            stats = benchmark.stats.stats
+            benchmark.extra_info["per_interaction_ms"] = stats.median / interactions * 1000
+            name = request.node.nodeid
+            fastest = stats.min
+            for _ in range(RECHECKS):
+                if not baseline.is_slower(name, fastest):
+                    break
+                time.sleep(RECHECK_PAUSE_S)
+                fastest = min(fastest, fastest_round(fn, args, stats.rounds))
+            baseline.check(name, stats.median, fastest, peak)
+        return result
+    return run
+
+
+def fastest_round(fn, args, rounds):
+    best = None
+    deadline = time.perf_counter() + RECHECK_TIME_S
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(*args)
+        end = time.perf_counter()
+        best = end - start if best is None else min(best, end - start)
+        if end > deadline:
+            break
+    return best
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,85 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtTest import QTest
+
+from launcher import load_script
+from ryuu_core.calculator import ARITHMETICS, CalculatorState
+
+SEQUENCES = {
+    "digits": "1234567890" * 3 + "C",
+    "chained_ops": "12+34×5−6÷7+89=" * 4 + "C",
+    "edits": "987654⌫⌫±±⌫3.5=" * 4 + "C",
+}
+
+
+@pytest.fixture(scope="module")
+def calculator(qapp):
+    window = load_script("Calculator_Ryuu.py").CalculatorUI()
+    window.show()
+    yield window
+    window.close()
+
+
+@pytest.mark.parametrize("name", SEQUENCES)
+def test_button_sequence(perf, calculator, name):
+    buttons = [calculator.buttons[key] for key in SEQUENCES[name]]
+
+    def click_all():
+        for button in buttons:
+            QTest.mouseClick(button, Qt.MouseButton.LeftButton)
+
+    perf(click_all, interactions=len(buttons))
+    assert calculator.display.text() == ""
+
+
+def test_typed_burst(perf, calculator):
+    # A scanner-style burst: every key arrives before the next frame
+    keys = "1234567890" * 100 + "+1=C"
+
+    def type_all():
+        QTest.keyClicks(calculator, keys)
+        calculator.flush_input()
+
+    perf(type_all, interactions=len(keys))
+    assert calculator.display.text() == ""
+
+
+def test_paste_long_number(perf, calculator):
+    number = "9876543210" * 10_000
+
+    def paste():
+        calculator.paste(number + "+1=")
+        calculator.flush_input()
+        calculator.clear_pressed()
+
+    perf(paste)
+
+
+def test_paste_column_statistics(perf, calculator):
+    # A pasted spreadsheet column, read a chunk per event loop pass
+    column = "Amount\n" + "\n".join(f"{index}.25" for index in range(100_000))
+
+    def paste():
+        calculator.clear_pressed()
+        calculator.paste(column)
+        while calculator.stats is not None:
+            QCoreApplication.processEvents()
+        return calculator.display.text()
+
+    assert perf(paste, rounds=5) == "4999975000"
+    assert calculator.expr_label.text().startswith("n 100000 · mean 49999.75")
+
+
+@pytest.mark.parametrize("name", ARITHMETICS)
+def test_integer_ledger(perf, name):
+    # Whole amounts stay on the int path in the exact backends, so they cost
+    # about what float does
+    state = CalculatorState(ARITHMETICS[name])
+    keys = "".join(f"{amount}+" for amount in range(1000, 1500)) + "0=C"
+
+    def total():
+        state.feed(keys)
+        return state.expression
+
+    perf(total, interactions=len(keys))
+
@@ -0,0 +1,39 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, QThreadPool
+
+import launcher
+
+
+@pytest.fixture(scope="module")
+def hub(qapp, tmp_path_factory):
+    # Login builds its credential files in the working directory
+    workdir = tmp_path_factory.mktemp("launcher")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(workdir)
+        patch.setattr(launcher, "SERVER_NAME", str(workdir / "hub.sock"))
+        hub = launcher.Launcher()
+        assert hub.listen()
+        for name in launcher.TOOLS:
+            hub.tool_window(name)
+        yield hub
+        for window in hub.windows.values():
+            window.close()
+        hub.server.close()
+        # Login writes its admin account from the pool; let it finish here
+        QThreadPool.globalInstance().waitForDone()
+
+
+@pytest.mark.parametrize("name", launcher.TOOLS)
+def test_repeat_launch(perf, hub, name):
+    window = hub.windows[name]
+
+    def relaunch():
+        # What a second ``launcher.py NAME`` does, up to the window showing
+        window.close()
+        assert launcher.send([name])
+        while not window.isVisible():
+            QCoreApplication.processEvents()
+
+    perf(relaunch)
+    assert hub.windows[name] is window
+
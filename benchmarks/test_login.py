@@ -0,0 +1,59 @@
+import itertools
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from launcher import load_script
+
+# Each round trip includes a real scrypt hash, so keep the round count low
+ROUNDS = 5
+
+
+@pytest.fixture
+def login(qapp, tmp_path, monkeypatch):
+    # Model writes TaskManagerLogin.json to the working directory
+    monkeypatch.chdir(tmp_path)
+    module = load_script("Login.py")
+    view = module.View()
+    controller = module.Controller(view)
+    view.show()
+    yield view, controller
+    view.close()
+
+
+def round_trip(view, controller, handler, username, password):
+    view.username_input.setText(username)
+    view.password_input.setText(password)
+    handler()
+    while controller.busy:
+        QCoreApplication.processEvents()
+    return view.label_validation.text()
+
+
+def test_signup(perf, login):
+    view, controller = login
+    names = (f"user{index}" for index in itertools.count())
+
+    def signup():
+        return round_trip(view, controller, controller.handle_signup, next(names), "secret")
+
+    assert perf(signup, rounds=ROUNDS) == "User created successfully"
+
+
+def test_login(perf, login):
+    view, controller = login
+    round_trip(view, controller, controller.handle_signup, "alice", "secret")
+
+    def log_in():
+        return round_trip(view, controller, controller.handle_login, "alice", "secret")
+
+    assert perf(log_in, rounds=ROUNDS) == "Login successful"
+
+
+def test_admin_login(perf, login):
+    view, controller = login
+
+    def log_in():
+        return round_trip(view, controller, controller.handle_admin_login, "admin", "admin104")
+
+    assert perf(log_in, rounds=ROUNDS) == "Admin login successful"
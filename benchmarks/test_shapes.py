@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from PySide6.QtCore import QCoreApplication, Qt
+
+from launcher import load_script
+
+CASES = {
+    "rectangle": ({"Width": "3", "Height": "4"}, "Area: 12.00"),
+    "circle": ({"Radius": "1"}, "Area: 3.14"),
+    "triangle": ({"Side 1": "3", "Side 2": "4", "Side 3": "5"}, "Area: 6.00"),
+}
+
+
+@pytest.fixture(scope="module")
+def window(qapp):
+    window = load_script("PySide Shape Calc.py").MainWindow()
+    window.show()
+    yield window
+    window.close()
+
+
+@pytest.mark.parametrize("shape", CASES)
+def test_on_calculate(perf, window, shape):
+    values, expected = CASES[shape]
+    window.select_shape(shape)
+    for label, text in values.items():
+        window.input_page(shape).inputs[label].setText(text)
+
+    perf(window.on_calculate)
+    assert window.result_label.text().startswith(expected)
+
+
+# A million-vertex outline: a circle of radius 1000 far from the origin
+OUTLINE_VERTICES = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def outline():
+    angles = np.linspace(0, 2 * np.pi, OUTLINE_VERTICES, endpoint=False)
+    return np.column_stack([5e5 + 1000 * np.cos(angles), 4e6 + 1000 * np.sin(angles)])
+
+
+def test_polygon_area_perimeter(perf, outline):
+    from ryuu_core.polygon import Polygon
+    polygon = Polygon(outline)
+
+    area, perimeter = perf(lambda: (polygon.area(), polygon.perimeter()))
+    assert area == pytest.approx(np.pi * 1000 ** 2, rel=1e-9)
+    assert perimeter == pytest.approx(2 * np.pi * 1000, rel=1e-9)
+
+
+@pytest.mark.parametrize("points", ["random", "ordered"])
+def test_polygon_convex_hull(perf, outline, points):
+    from ryuu_core.polygon import Polygon
+    rng = np.random.default_rng(0)
+    if points == "random":
+        # Mostly interior points; the hull is a few dozen vertices
+        polygon = Polygon(rng.random((OUTLINE_VERTICES, 2)))
+    else:
+        polygon = Polygon(outline)
+
+    hull = perf(polygon.convex_hull, rounds=3)
+    if points == "random":
+        assert 0.99 < hull.area() <= 1
+    else:
+        assert len(hull) == OUTLINE_VERTICES
+
+
+# A bulk shape list for the results table
+BULK_SHAPES = 500_000
+
+
+@pytest.fixture(scope="module")
+def shape_file(tmp_path_factory):
+    from ryuu_core.shape_batch import MAX_FIELDS
+    from ryuu_core.shape_stream import write_binary
+    rng = np.random.default_rng(0)
+    path = tmp_path_factory.mktemp("bulk") / "shapes.bin"
+    write_binary(path, rng.integers(0, 3, BULK_SHAPES), rng.uniform(1, 10, (BULK_SHAPES, MAX_FIELDS)))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def results(window):
+    results = window.show_results()
+    yield results
+    results.close()
+
+
+def wait_for(condition):
+    while not condition():
+        QCoreApplication.processEvents()
+
+
+def test_results_load(perf, results, shape_file):
+    def load():
+        results.load(shape_file)
+        wait_for(lambda: not results.loading)
+
+    perf(load, rounds=3)
+    assert len(results.table) == BULK_SHAPES
+    # Only the first rows are handed to the view
+    assert results.model.rowCount() < BULK_SHAPES
+
+
+def test_results_sort_filter(perf, results, shape_file):
+    if results.table is None or len(results.table) != BULK_SHAPES:
+        results.load(shape_file)
+        wait_for(lambda: not results.loading)
+    header = results.view.horizontalHeader()
+
+    def sort_and_filter():
+        # Drop the cached orders so every round sorts from scratch
+        results.table._orders.clear()
+        results.table._kind_rows.clear()
+        header.setSortIndicator(3, Qt.SortOrder.DescendingOrder)
+        results.kind_filter.setCurrentIndex(3)
+        wait_for(lambda: results.status_label.text().endswith(f"of {BULK_SHAPES:,} shapes"))
+        rows = results.model.rows
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        results.kind_filter.setCurrentIndex(0)
+        wait_for(lambda: results.status_label.text() == f"{BULK_SHAPES:,} of {BULK_SHAPES:,} shapes")
+        return rows
+
+    rows = perf(sort_and_filter, rounds=3)
+    areas = results.table.areas[rows]
+    assert (results.table.codes[rows] == 2).all()
+    assert (np.diff(areas[~np.isnan(areas)]) <= 0).all()
@@ -0,0 +1,167 @@
+"""Opt-in event-loop responsiveness monitor for the Ryuu apps.
+
+Set ``RYUU_EVENT_TRACE`` to a file path to turn it on::
+
+    RYUU_EVENT_TRACE=trace.json python Calculator_Ryuu.py
+
+Every event the application delivers is timed in ``QApplication.notify``,
+and methods decorated with ``@slot`` are timed on every call. A handler that
+runs longer than the frame budget (``RYUU_FRAME_BUDGET_MS``, 16 by default)
+is reported on stderr when it happens, except for handlers that opened a
+modal dialog, which block by design until it closes. At exit a summary per slot and per
+event type goes to stderr, and every recorded span goes to the trace file in
+Chrome trace format, for chrome://tracing or https://ui.perfetto.dev.
+
+With the variable unset, ``create_application`` returns a plain
+``QApplication`` and ``slot`` returns the function unchanged, so the event
+path is exactly as without the monitor.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication
+
+from ryuu_core.instrumentation import Histogram
+
+TRACE_PATH = os.environ.get("RYUU_EVENT_TRACE")
+ENABLED = bool(TRACE_PATH)
+DEFAULT_FRAME_BUDGET_MS = 16
+# Only the most recent spans are kept, so long sessions stay bounded
+MAX_SPANS = 200_000
+
+event_stats = {}
+slot_stats = {}
+slow_counts = {}
+# (category, name, start_ns, duration_ns, thread id, receiver class or None)
+spans = deque(maxlen=MAX_SPANS)
+_event_names = {}
+# Modal dialogs shown so far; a handler during which this changed ran one
+_modal_shows = 0
+
+
+def frame_budget_ns():
+    text = os.environ.get("RYUU_FRAME_BUDGET_MS")
+    try:
+        budget = float(text) if text else DEFAULT_FRAME_BUDGET_MS
+    except ValueError:
+        budget = None
+    if budget is None or not 0 < budget < float("inf"):
+        print(f"eventmonitor: ignoring RYUU_FRAME_BUDGET_MS={text!r}, "
+              f"using {DEFAULT_FRAME_BUDGET_MS} ms", file=sys.stderr)
+        budget = DEFAULT_FRAME_BUDGET_MS
+    return int(budget * 1_000_000)
+
+
+# Only read when the monitor is on, so a bad value cannot stop the apps
+FRAME_BUDGET_NS = frame_budget_ns() if ENABLED else DEFAULT_FRAME_BUDGET_MS * 1_000_000
+
+
+def record(category, name, start, duration, receiver=None, modal=False):
+    stats = slot_stats if category == "slot" else event_stats
+    histogram = stats.get(name)
+    if histogram is None:
+        histogram = stats[name] = Histogram()
+    histogram.record(duration)
+    spans.append((category, name, start, duration, threading.get_ident(), receiver))
+    if duration > FRAME_BUDGET_NS and not modal:
+        slow_counts[category, name] = slow_counts.get((category, name), 0) + 1
+        target = f" on {receiver}" if receiver else ""
+        print(f"eventmonitor: {category} {name}{target} blocked the event loop "
+              f"for {duration / 1e6:.1f} ms", file=sys.stderr)
+
+
+def event_name(event_type):
+    name = _event_names.get(event_type)
+    if name is None:
+        # User event types have no enum member
+        name = _event_names[event_type] = getattr(event_type, "name", None) or f"User{int(event_type)}"
+    return name
+
+
+class MonitoredApplication(QApplication):
+
+    def notify(self, receiver, event):
+        # Read before delivery; the event may be deleted by its handler
+        global _modal_shows
+        event_type = event.type()
+        name = event_name(event_type)
+        if event_type == QEvent.Type.Show and receiver.isWidgetType() and receiver.isModal():
+            _modal_shows += 1
+        modals = _modal_shows
+        start = perf_counter_ns()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            record("event", name, start, perf_counter_ns() - start, type(receiver).__name__,
+                   _modal_shows != modals)
+
+
+def create_application(argv):
+    """Create the app's ``QApplication``, monitored when ``RYUU_EVENT_TRACE`` is set."""
+    # The theme needs Fusion. Qt builds it from this variable at startup,
+    # while choosing it from Python means loading PySide's QStyle bindings
+    # (about 10 ms) before the first window
+    os.environ.setdefault("QT_STYLE_OVERRIDE", "Fusion")
+    if not ENABLED:
+        return QApplication(argv)
+    app = MonitoredApplication(argv)
+    atexit.register(report)
+    return app
+
+
+def slot(func):
+    """Time every call of a slot; returns ``func`` itself when the monitor is off."""
+    if not ENABLED:
+        return func
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        modals = _modal_shows
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record("slot", name, start, perf_counter_ns() - start, modal=_modal_shows != modals)
+
+    return wrapper
+
+
+def dump(file=None):
+    file = file or sys.stderr
+    print(f"{'handler':<48} {'count':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'slow':>6}",
+          file=file)
+    for category, stats in (("slot", slot_stats), ("event", event_stats)):
+        # Worst offenders first
+        for name, histogram in sorted(stats.items(), key=lambda item: -item[1].max):
+            print(f"{category + ' ' + name:<48} {histogram.count:>8} "
+                  f"{histogram.percentile(0.50) / 1e6:>8.3f} {histogram.percentile(0.99) / 1e6:>8.3f} "
+                  f"{histogram.max / 1e6:>8.3f} {slow_counts.get((category, name), 0):>6}", file=file)
+
+
+def export_trace(path):
+    # Spans are stored as they end, so an outer one follows those inside it
+    origin = min((span[2] for span in spans), default=0)
+    pid = os.getpid()
+    events = []
+    for category, name, start, duration, thread, receiver in spans:
+        event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": thread,
+                 "ts": (start - origin) / 1000, "dur": duration / 1000}
+        if receiver:
+            event["args"] = {"receiver": receiver}
+        events.append(event)
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def report():
+    if spans:
+        export_trace(TRACE_PATH)
+        dump()
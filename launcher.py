@@ -0,0 +1,242 @@
+"""Launcher hub that hosts all three Ryuu apps in one warm process.
+
+    python launcher.py [--resident] [calculator] [login] [shapes]
+
+The first launch creates a single ``QApplication`` and opens the named tools,
+or the hub window when none are named. The remaining tool windows are then
+built one at a time while the event loop is idle, so opening one later only
+shows a window that already exists. Closing a tool window hides it for reuse.
+
+Later launches reach the running hub through a local socket, pass it the
+tool names and exit, and the hub raises the warm windows. Unless started with
+``--resident``, the hub exits when its last window closes, like the apps do.
+"""
+import argparse
+import getpass
+import importlib.util
+import os
+import socket
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SERVER_NAME = os.environ.get("RYUU_LAUNCHER_NAME") or f"ryuu-launcher-{getpass.getuser()}"
+if os.name != "nt":
+    # A full path lets a repeat launch connect with the socket module alone
+    SERVER_NAME = os.path.join(tempfile.gettempdir(), SERVER_NAME)
+CONNECT_TIMEOUT_MS = 250
+# Leave the first window time to paint before building the others
+PREBUILD_DELAY_MS = 300
+
+
+def build_calculator(module):
+    return module.CalculatorUI(), None
+
+
+def build_login(module):
+    view = module.View()
+    return view, module.Controller(view, module.create_model())
+
+
+def build_shapes(module):
+    return module.MainWindow(), None
+
+
+# Tool name: (hub button label, script, builder returning the window and
+# anything else that must stay alive with it)
+TOOLS = {
+    "calculator": ("Calculator", "Calculator_Ryuu.py", build_calculator),
+    "login": ("Login", "Login.py", build_login),
+    "shapes": ("Shape Calculator", "PySide Shape Calc.py", build_shapes),
+}
+
+
+def load_script(filename):
+    """Import one of the app scripts by file name (the shape one has spaces)."""
+    spec = importlib.util.spec_from_file_location(
+        os.path.splitext(filename)[0].replace(" ", "_"), os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resident", action="store_true",
+                        help="keep running after the last window closes")
+    parser.add_argument("tools", nargs="*", help=f"any of {', '.join(TOOLS)} (default: the hub)")
+    args = parser.parse_args(argv)
+    unknown = set(args.tools) - set(TOOLS)
+    if unknown:
+        parser.error(f"unknown tool: {', '.join(sorted(unknown))}")
+    return args
+
+
+def send(names):
+    """Pass ``names`` to a running hub; returns False if none is running."""
+    message = (" ".join(names) + "\n").encode("utf-8")
+    if os.name == "nt":
+        # Local servers are named pipes here
+        from PySide6.QtNetwork import QLocalSocket
+        client = QLocalSocket()
+        client.connectToServer(SERVER_NAME)
+        if not client.waitForConnected(CONNECT_TIMEOUT_MS):
+            return False
+        client.write(message)
+        client.waitForBytesWritten(CONNECT_TIMEOUT_MS)
+        client.disconnectFromServer()
+        return True
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONNECT_TIMEOUT_MS / 1000)
+        try:
+            client.connect(SERVER_NAME)
+            client.sendall(message)
+        except OSError:
+            # No socket file, or one left behind by a hub that crashed
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    _args = parse_args()
+    # A repeat launch only hands the tool names to the running hub, so it
+    # does that before PySide6 is imported
+    if send(_args.tools):
+        sys.exit(0)
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtWidgets import QPushButton, QVBoxLayout, QWidget
+
+from eventmonitor import create_application, slot
+from theme import install_theme
+
+
+class Launcher(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Ryuu Launcher")
+        self.windows = {}
+        self.owners = {}
+
+        layout = QVBoxLayout()
+        for name, (label, _script, _build) in TOOLS.items():
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked=False, name=name: self.show_tool(name))
+            layout.addWidget(button)
+        self.setLayout(layout)
+        install_theme(self)
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+        self.prebuild_timer = QTimer(self)
+        self.prebuild_timer.setSingleShot(True)
+        self.prebuild_timer.timeout.connect(self.prebuild_next)
+
+    def listen(self):
+        # Another launch may have become the hub since this one looked. With
+        # UserAccessOption, listen() replaces an existing socket file even
+        # when it is live, so ask first
+        probe = QLocalSocket()
+        probe.connectToServer(SERVER_NAME)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.abort()
+            return False
+        if self.server.listen(SERVER_NAME):
+            return True
+        # Nothing answered, so whatever holds the name is left from a hub
+        # that crashed
+        QLocalServer.removeServer(SERVER_NAME)
+        return self.server.listen(SERVER_NAME)
+
+    def tool_window(self, name):
+        window = self.windows.get(name)
+        if window is None:
+            _label, script, build = TOOLS[name]
+            window, owner = build(load_script(script))
+            # Polishing and laying out now takes that work off the first show
+            window.ensurePolished()
+            window.layout().activate()
+            self.windows[name] = window
+            if owner is not None:
+                self.owners[name] = owner
+        return window
+
+    @slot
+    def show_tool(self, name):
+        window = self.tool_window(name)
+        reset_inputs = getattr(window, "reset_inputs", None)
+        if reset_inputs is not None and not window.isVisible():
+            # A reused login form must not show the last user's password
+            reset_inputs()
+        self.bring_up(window)
+        self.schedule_prebuild()
+
+    def bring_up(self, window):
+        window.show()
+        window.setWindowState(window.windowState() & ~Qt.WindowState.WindowMinimized)
+        window.raise_()
+        window.activateWindow()
+
+    def open_tools(self, names):
+        for name in names:
+            if name in TOOLS:
+                self.show_tool(name)
+        if not names:
+            self.bring_up(self)
+            self.schedule_prebuild()
+
+    def schedule_prebuild(self):
+        # Restarting the delay on every request keeps prebuilding out of the
+        # way while the user is opening windows
+        if len(self.windows) < len(TOOLS):
+            self.prebuild_timer.start(PREBUILD_DELAY_MS)
+
+    @slot
+    def prebuild_next(self):
+        # One window per pass, so input arriving in between is not held up
+        # for all of them
+        for name in TOOLS:
+            if name not in self.windows:
+                self.tool_window(name)
+                break
+        if len(self.windows) < len(TOOLS):
+            self.prebuild_timer.start(0)
+
+    @slot
+    def accept(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.read_request(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            # The request may already be buffered
+            self.read_request(connection)
+
+    def read_request(self, connection):
+        # One readyRead may bring several requests
+        while connection.canReadLine():
+            names = bytes(connection.readLine()).decode("utf-8").split()
+            self.open_tools(names)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if send(args.tools):
+        return 0
+
+    app = create_application(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(not args.resident)
+    launcher = Launcher()
+    if not launcher.listen():
+        # Another launch may have become the hub since the send() above
+        if send(args.tools):
+            return 0
+        print(f"launcher: cannot listen on {SERVER_NAME}: {launcher.server.errorString()}",
+              file=sys.stderr)
+    launcher.open_tools(args.tools)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
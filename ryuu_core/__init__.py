@@ -0,0 +1,8 @@
+"""Qt-free logic shared by the Ryuu PySide6 apps.
+
+The GUI scripts are thin views over these modules, and batch tools, the
+authentication service and worker processes import them directly. Nothing
+in this package may import PySide6, even indirectly, so that those
+processes never pay for loading Qt; tests/test_qt_free.py checks it.
+Shared Qt code, such as the theme, lives next to the scripts instead.
+"""
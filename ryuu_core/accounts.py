@@ -0,0 +1,82 @@
+import hmac
+
+from ryuu_core.credentials import CredentialStore
+from ryuu_core.instrumentation import timed
+from ryuu_core.passwords import hash_password, needs_rehash, verify_password
+
+
+class AccountModel:
+    """Sign-up and login checks behind ``Login.Model``, without any widgets."""
+
+    def __init__(self, filename="TaskManagerLogin.json"):
+        self.filename = filename
+        self.store = CredentialStore(self.filename)
+
+    @property
+    def login_data(self):
+        return self.store.users
+
+    @timed
+    def save_user(self, username, password):
+        self.store.put(username, password_hash=hash_password(password), admin=False)
+        return [username, password]
+
+    @timed
+    def create_admin_login(self):
+        admin_username = "admin"
+        admin_password = "admin104"
+        # Only write when missing, so startup neither hashes nor grows the journal
+        record = self.store.get(admin_username)
+        if record is None or not record["admin"]:
+            self.store.put(admin_username, password_hash=hash_password(admin_password), admin=True)
+        return [admin_username, admin_password]
+
+    @timed
+    def check_password(self, username, password, record):
+        # Hashing is slow by design; callers run this off the GUI thread
+        if "password_hash" in record:
+            valid = verify_password(password, record["password_hash"])
+            upgrade = valid and needs_rehash(record["password_hash"])
+        else:
+            # Plaintext record from before hashing; upgrade it on first login
+            valid = hmac.compare_digest(password.encode(), record["password"].encode())
+            upgrade = valid
+        if upgrade:
+            self.store.put(username, password_hash=hash_password(password), admin=record["admin"])
+        return valid
+
+    @timed
+    def load_user(self):
+        self.store.refresh()
+        return self.login_data
+
+    @timed
+    def sign_up_button(self, username, password):
+        if not username or not password:
+            return "Please enter a username and password"
+        if username in self.store:
+            return "Username already exists"
+        # Hash outside the store lock, then claim the name atomically
+        if not self.store.add(username, password_hash=hash_password(password), admin=False):
+            return "Username already exists"
+        return username, password, "User created successfully"
+
+    @timed
+    def login_button(self, username, password):
+        record = self.store.get(username)
+        if record is None or record["admin"]:
+            return "No user found. Please sign up first."
+        if self.check_password(username, password, record):
+            return username, password, "Login successful"
+        else:
+            return "Invalid username or password"
+
+    @timed
+    def admin_login_button(self, username, password):
+        record = self.store.get(username)
+        if record is None or not record["admin"]:
+            return "Admin login not found. Please create an admin login first."
+        if self.check_password(username, password, record):
+            return username, password, "Admin login successful"
+        else:
+            return "Invalid admin username or password"
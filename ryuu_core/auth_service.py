@@ -0,0 +1,351 @@
+"""Local authentication service sharing one warm ``AccountModel``.
+
+GUI clients and scripts on the same host talk to one process that keeps the
+user index in memory, instead of each re-reading ``TaskManagerLogin.json``.
+
+The protocol is newline-delimited JSON. A request is
+``{"id": 1, "op": "signup" | "login" | "admin_login", "username": ..., "password": ...}``
+and its response ``{"id": 1, "ok": true, "message": "Login successful"}``.
+Requests on one connection may be pipelined; responses carry the request id
+and can arrive out of order.
+
+Addresses are ``unix:/path/to/socket`` or ``host:port`` (TCP, meant for
+127.0.0.1). The Login window uses the service when ``RYUU_AUTH_SERVICE``
+holds an address.
+
+    python -m ryuu_core.auth_service serve [--address ADDR]
+    python -m ryuu_core.auth_service load [--address ADDR] [--connections 200] [--requests 5000]
+"""
+import argparse
+import asyncio
+import errno
+import json
+import os
+import socket
+import stat
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ryuu_core.accounts import AccountModel
+from ryuu_core.passwords import hash_password
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+ADDRESS_ENV = "RYUU_AUTH_SERVICE"
+MAX_WRITE_BATCH = 1000
+
+
+def parse_address(address):
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def remove_stale_socket(path):
+    """Remove a unix socket left behind by a service that has exited.
+
+    Raises OSError if a service is still listening on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        # Not ours to delete; binding reports it
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another service is listening", path)
+
+
+async def open_connection(address):
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+# Server
+
+class BatchWriter:
+    """Collects sign-ups that arrive together and adds them in one journal write."""
+
+    def __init__(self, store, executor):
+        self.store = store
+        self.executor = executor
+        self.queue = asyncio.Queue()
+
+    async def add(self, username, record):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((username, record, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty() and len(batch) < MAX_WRITE_BATCH:
+                batch.append(self.queue.get_nowait())
+            accounts = [(username, record) for username, record, _ in batch]
+            try:
+                added = await loop.run_in_executor(self.executor, self.store.add_many, accounts)
+            except Exception as error:
+                for _, _, future in batch:
+                    future.set_exception(error)
+                continue
+            for (_, _, future), result in zip(batch, added):
+                future.set_result(result)
+
+
+class AuthService:
+
+    def __init__(self, model=None, workers=None):
+        self.model = model or AccountModel()
+        # Hashing releases the GIL, so threads spread it over every core
+        self.executor = ThreadPoolExecutor(workers or os.cpu_count())
+        self.writer = None
+
+    async def signup(self, username, password):
+        if not username or not password:
+            return "Please enter a username and password"
+        loop = asyncio.get_running_loop()
+        password_hash = await loop.run_in_executor(self.executor, self.hash_new_user, username, password)
+        if password_hash is None or not await self.writer.add(
+                username, {"password_hash": password_hash, "admin": False}):
+            return "Username already exists"
+        return username, password, "User created successfully"
+
+    def hash_new_user(self, username, password):
+        # Runs in the executor, since the membership check may wait on the
+        # store lock; returns None for a taken name to skip the hash
+        if username in self.model.store:
+            return None
+        return hash_password(password)
+
+    async def handle_request(self, request):
+        op = request["op"]
+        username = request["username"]
+        password = request["password"]
+        if not isinstance(username, str) or not isinstance(password, str):
+            raise TypeError("username and password must be strings")
+        if op == "signup":
+            result = await self.signup(username, password)
+        elif op == "login":
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.model.login_button, username, password)
+        elif op == "admin_login":
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.model.admin_login_button, username, password)
+        else:
+            raise ValueError(f"unknown op {op!r}")
+        if isinstance(result, tuple):
+            return {"id": request.get("id"), "ok": True, "message": result[2]}
+        return {"id": request.get("id"), "ok": False, "message": result}
+
+    async def respond(self, line, writer):
+        request = None
+        try:
+            request = json.loads(line)
+            response = await self.handle_request(request)
+        except Exception as error:
+            # Every line gets a reply, or a pipelining client would wait for
+            # it until it times out
+            request_id = request.get("id") if isinstance(request, dict) else None
+            response = {"id": request_id, "ok": False, "message": f"Bad request: {error}"}
+        writer.write(json.dumps(response).encode() + b"\n")
+
+    async def handle_connection(self, reader, writer):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self.respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                await writer.drain()
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address=DEFAULT_ADDRESS):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.model.create_admin_login)
+        self.writer = BatchWriter(self.model.store, self.executor)
+        writer_task = asyncio.create_task(self.writer.run())
+        kind, target = parse_address(address)
+        if kind == "unix":
+            remove_stale_socket(target)
+            server = await asyncio.start_unix_server(self.handle_connection, target)
+        else:
+            server = await asyncio.start_server(self.handle_connection, *target)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer_task.cancel()
+
+
+# Client
+
+class AuthClient:
+    """Blocking client; one request at a time per client, safe to share between threads."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=30):
+        self.address = address
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.file = None
+        self.next_id = 0
+
+    def connect(self):
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+        else:
+            sock = socket.create_connection(target, timeout=self.timeout)
+        self.file = sock.makefile("rwb")
+        sock.close()  # the file object keeps the connection open
+
+    def request(self, op, username, password):
+        with self.lock:
+            if self.file is None:
+                self.connect()
+            self.next_id += 1
+            message = {"id": self.next_id, "op": op, "username": username, "password": password}
+            try:
+                self.file.write(json.dumps(message).encode() + b"\n")
+                self.file.flush()
+                line = self.file.readline()
+            except OSError:
+                self.close()
+                raise
+            if not line:
+                self.close()
+                raise ConnectionError("authentication service closed the connection")
+            response = json.loads(line)
+            return response["ok"], response["message"]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class RemoteAccountModel:
+    """Drop-in for ``AccountModel`` in the Login controller, backed by the service."""
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        self.client = AuthClient(address)
+
+    def _call(self, op, username, password):
+        ok, message = self.client.request(op, username, password)
+        return (username, password, message) if ok else message
+
+    def create_admin_login(self):
+        # The service creates the admin account when it starts
+        pass
+
+    def sign_up_button(self, username, password):
+        return self._call("signup", username, password)
+
+    def login_button(self, username, password):
+        return self._call("login", username, password)
+
+    def admin_login_button(self, username, password):
+        return self._call("admin_login", username, password)
+
+
+# Load generator
+
+async def _load_connection(address, requests, latencies, failures):
+    reader, writer = await open_connection(address)
+    try:
+        for number, (op, username, password) in enumerate(requests):
+            start = time.perf_counter()
+            message = {"id": number, "op": op, "username": username, "password": password}
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if not response["ok"]:
+                failures.append(response["message"])
+    finally:
+        writer.close()
+
+
+async def _run_phase(address, requests, connections):
+    latencies = []
+    failures = []
+    # Deal requests round-robin so every connection gets a share
+    shares = [requests[index::connections] for index in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_connection(address, share, latencies, failures)
+                           for share in shares if share))
+    return time.perf_counter() - start, latencies, failures
+
+
+def _report(name, elapsed, latencies, failures):
+    latencies = sorted(latencies)
+    if not latencies:
+        print(f"{name}: no requests")
+        return
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(f"{name}: {len(latencies)} requests in {elapsed:.2f} s "
+          f"= {len(latencies) / elapsed:.0f} req/s, {len(failures)} failed")
+    print(f"  latency ms  p50 {quantiles[49] * 1000:.1f}  p90 {quantiles[89] * 1000:.1f}  "
+          f"p99 {quantiles[98] * 1000:.1f}  max {latencies[-1] * 1000:.1f}")
+
+
+async def load(address, connections, requests, users):
+    prefix = f"load{os.getpid()}-{int(time.time())}"
+    accounts = [(f"{prefix}-{index}", f"password{index}") for index in range(users)]
+    signups = [("signup", username, password) for username, password in accounts]
+    _report("signup", *await _run_phase(address, signups, connections))
+    logins = [("login", *accounts[index % users]) for index in range(requests)]
+    _report("login", *await _run_phase(address, logins, connections))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ryuu_core.auth_service")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the service")
+    serve_parser.add_argument("--address", default=os.environ.get(ADDRESS_ENV, DEFAULT_ADDRESS))
+    serve_parser.add_argument("--workers", type=int, default=None, help="hashing threads")
+    serve_parser.add_argument("--file", default="TaskManagerLogin.json", help="credential store")
+    load_parser = commands.add_parser("load", help="load-test a running service")
+    load_parser.add_argument("--address", default=os.environ.get(ADDRESS_ENV, DEFAULT_ADDRESS))
+    load_parser.add_argument("--connections", type=int, default=200)
+    load_parser.add_argument("--requests", type=int, default=5000)
+    load_parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        service = AuthService(AccountModel(args.file), args.workers)
+        try:
+            asyncio.run(service.serve(args.address))
+        except KeyboardInterrupt:
+            pass
+        except OSError as error:
+            if error.filename:
+                error = f"{error.filename}: {error.strerror}"
+            parser.exit(1, f"error: {error}\n")
+    else:
+        asyncio.run(load(args.address, args.connections, args.requests, args.users))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
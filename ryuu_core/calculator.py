@@ -0,0 +1,594 @@
+import decimal
+import operator
+import re
+import sys
+from fractions import Fraction
+from functools import lru_cache
+
+
+def safe_divide(a, b):
+    if b == 0:
+        return "Error"
+    return a / b
+
+
+OPERATIONS = {
+    "÷": safe_divide,
+    "×": operator.mul,
+    "−": operator.sub,
+    "+": operator.add,
+}
+
+
+def format_number(value):
+    """Display integers without .0 and floats normally."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# Arithmetic backends
+
+FORMAT_CACHE_SIZE = 1024
+# Significant digits past the integer part shown for a fraction that has no
+# finite decimal expansion
+FRACTION_DIGITS = 28
+
+
+class FloatArithmetic:
+    """How the calculator reads, computes and shows numbers: binary floats.
+
+    ``operations`` maps each operator to a function of two numbers that
+    returns ``"Error"`` on division by zero, like ``OPERATIONS``; ``negate``
+    is unary minus.
+    """
+
+    name = "float"
+
+    def __init__(self):
+        self.operations = OPERATIONS
+        # Typed, so equal values of different types are formatted separately
+        self.format = lru_cache(maxsize=FORMAT_CACHE_SIZE, typed=True)(self.format_value)
+
+    def parse(self, text):
+        return float(text)
+
+    def negate(self, value):
+        return -value
+
+    def coerce(self, value):
+        """Convert a number from outside, such as a statistics result, to this backend."""
+        return float(value)
+
+    def format_value(self, value):
+        return format_number(value)
+
+
+def _parse_decimal(text):
+    try:
+        return decimal.Decimal(text)
+    except decimal.InvalidOperation:
+        raise ValueError(f"Not a number: {text!r}") from None
+
+
+def _int_text(value):
+    # str() refuses ints longer than sys.get_int_max_str_digits(), 4300 by
+    # default; Decimal converts them without that limit
+    try:
+        return str(value)
+    except ValueError:
+        return format(decimal.Decimal(value), "f")
+
+
+def _int_fast_path(int_operation, operation):
+    def apply(a, b):
+        if type(a) is int and type(b) is int:
+            return int_operation(a, b)
+        return operation(a, b)
+    return apply
+
+
+class ExactArithmetic(FloatArithmetic):
+    """Base for the exact backends: integers stay Python ints, exact at any
+    size, for as long as every operand is integral.
+
+    Subclasses handle everything else in ``parse_inexact`` and
+    ``operation``, and ``integral`` turns their integral results back into
+    ints, and so back onto the fast path.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.operations = {
+            "÷": self.divide,
+            "×": _int_fast_path(operator.mul, self.operation("×")),
+            "−": _int_fast_path(operator.sub, self.operation("−")),
+            "+": _int_fast_path(operator.add, self.operation("+")),
+        }
+
+    def parse(self, text):
+        try:
+            return int(text)
+        except ValueError:
+            # Also where integers past the int/str conversion limit end up
+            return self.integral(self.parse_inexact(text))
+
+    def coerce(self, value):
+        if type(value) is int:
+            return value
+        if isinstance(value, Fraction):
+            return self.divide(value.numerator, value.denominator)
+        # A float's shortest repr is the number the user saw
+        return self.parse(repr(value) if isinstance(value, float) else str(value))
+
+    def divide(self, a, b):
+        if b == 0:
+            return "Error"
+        if type(a) is int and type(b) is int:
+            quotient, remainder = divmod(a, b)
+            if not remainder:
+                return quotient
+        return self.operation("÷")(a, b)
+
+
+class DecimalArithmetic(ExactArithmetic):
+    """Exact integers, and ``decimal.Decimal`` in ``context`` for the rest."""
+
+    name = "decimal"
+
+    def __init__(self, context=None):
+        self.context = context or decimal.Context(prec=34)
+        super().__init__()
+
+    def operation(self, op):
+        method = {
+            "÷": self.context.divide,
+            "×": self.context.multiply,
+            "−": self.context.subtract,
+            "+": self.context.add,
+        }[op]
+        return lambda a, b: self.integral(method(a, b))
+
+    def negate(self, value):
+        # Plain -value would round to the thread's default context
+        if type(value) is int:
+            return -value
+        return self.context.minus(value)
+
+    def parse_inexact(self, text):
+        return _parse_decimal(text)
+
+    def integral(self, value):
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return value
+
+    def format_value(self, value):
+        if type(value) is int:
+            return _int_text(value)
+        return format(value.normalize(self.context), "f")
+
+
+class FractionArithmetic(ExactArithmetic):
+    """Exact integers, and ``fractions.Fraction`` for the rest, so division is exact too.
+
+    Fractions without a finite decimal expansion are shown rounded, but the
+    exact value is kept for further calculation.
+    """
+
+    name = "fraction"
+
+    def operation(self, op):
+        method = OPERATIONS[op] if op != "÷" else Fraction
+        return lambda a, b: self.integral(method(a, b))
+
+    def parse_inexact(self, text):
+        # Through Decimal, which unlike Fraction(text) has no digit limit
+        return Fraction(_parse_decimal(text))
+
+    def integral(self, value):
+        return value.numerator if value.denominator == 1 else value
+
+    def format_value(self, value):
+        if type(value) is int:
+            return _int_text(value)
+        whole = decimal.Decimal(abs(value.numerator) // value.denominator).adjusted() + 1
+        context = decimal.Context(prec=whole + FRACTION_DIGITS)
+        quotient = context.divide(decimal.Decimal(value.numerator), decimal.Decimal(value.denominator))
+        return format(quotient.normalize(context), "f")
+
+
+FLOAT = FloatArithmetic()
+ARITHMETICS = {
+    "float": FLOAT,
+    "decimal": DecimalArithmetic(),
+    "fraction": FractionArithmetic(),
+}
+
+
+# Expression engine
+
+EXPRESSION_CACHE_SIZE = 512
+
+# ASCII spellings are accepted so typed or pasted text works too
+OPERATOR_ALIASES = {
+    "+": "+", "-": "−", "−": "−",
+    "*": "×", "×": "×", "/": "÷", "÷": "÷",
+}
+PRECEDENCE = {"+": 1, "−": 1, "×": 2, "÷": 2}
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|(\S))")
+
+# Opcodes for the compiled form
+PUSH, LOAD, NEG, BINARY = range(4)
+NEGATE = "neg"
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def tokenize(text, number=float):
+    """Split an expression into ('num', number), ('name', str) and ('op', str) tokens.
+
+    ``number`` converts the text of each number.
+    """
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        number_text, name, symbol = match.groups()
+        if number_text is not None:
+            tokens.append(("num", number(number_text)))
+        elif name is not None:
+            tokens.append(("name", name))
+        elif symbol in OPERATOR_ALIASES:
+            tokens.append(("op", OPERATOR_ALIASES[symbol]))
+        elif symbol in "()":
+            tokens.append(("op", symbol))
+        else:
+            raise ExpressionError(f"Unexpected character {symbol!r}")
+        pos = match.end()
+    return tokens
+
+
+class Expression:
+    """A parsed expression in postfix bytecode form, ready to evaluate many times."""
+
+    __slots__ = ("text", "code", "names", "arithmetic")
+
+    def __init__(self, text, code, arithmetic=FLOAT):
+        self.text = text
+        self.code = tuple(code)
+        self.names = frozenset(arg for opcode, arg in code if opcode == LOAD)
+        self.arithmetic = arithmetic
+
+    def evaluate(self, variables=None):
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        coerce = self.arithmetic.coerce
+        for opcode, arg in self.code:
+            if opcode == PUSH:
+                push(arg)
+            elif opcode == LOAD:
+                try:
+                    push(coerce(variables[arg]))
+                except (KeyError, TypeError):
+                    raise ExpressionError(f"No value for {arg!r}") from None
+            elif opcode == NEG:
+                stack[-1] = arg(stack[-1])
+            else:
+                b = pop()
+                result = arg(stack[-1], b)
+                if result == "Error":
+                    return "Error"
+                stack[-1] = result
+        return stack[0]
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+
+def _emit_operator(code, op, arithmetic):
+    if op == NEGATE:
+        code.append((NEG, arithmetic.negate))
+    else:
+        code.append((BINARY, arithmetic.operations[op]))
+
+
+def parse(text, arithmetic=FLOAT):
+    """Compile an expression with the shunting-yard algorithm."""
+    code = []
+    pending = []  # operator stack
+    expect_operand = True
+    for kind, value in tokenize(text, arithmetic.parse):
+        if kind == "num":
+            if not expect_operand:
+                raise ExpressionError("Missing operator")
+            code.append((PUSH, value))
+            expect_operand = False
+        elif kind == "name":
+            if not expect_operand:
+                raise ExpressionError("Missing operator")
+            code.append((LOAD, value))
+            expect_operand = False
+        elif value == "(":
+            if not expect_operand:
+                raise ExpressionError("Missing operator")
+            pending.append(value)
+        elif value == ")":
+            if expect_operand:
+                raise ExpressionError("Missing operand")
+            while pending and pending[-1] != "(":
+                _emit_operator(code, pending.pop(), arithmetic)
+            if not pending:
+                raise ExpressionError("Unbalanced parentheses")
+            pending.pop()
+        elif expect_operand:
+            # Only minus (and a redundant plus) may appear in prefix position
+            if value == "−":
+                pending.append(NEGATE)
+            elif value != "+":
+                raise ExpressionError("Missing operand")
+        else:
+            while pending and pending[-1] != "(" and (
+                pending[-1] == NEGATE or PRECEDENCE[pending[-1]] >= PRECEDENCE[value]
+            ):
+                _emit_operator(code, pending.pop(), arithmetic)
+            pending.append(value)
+            expect_operand = True
+    if expect_operand:
+        raise ExpressionError("Missing operand" if code or pending else "Empty expression")
+    while pending:
+        op = pending.pop()
+        if op == "(":
+            raise ExpressionError("Unbalanced parentheses")
+        _emit_operator(code, op, arithmetic)
+    return Expression(text, code, arithmetic)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(text, arithmetic=FLOAT):
+    """Return the cached compiled form of ``text``, parsing it on first use."""
+    return parse(text, arithmetic)
+
+
+def evaluate(text, variables=None, arithmetic=FLOAT):
+    return compile_expression(text, arithmetic).evaluate(variables)
+
+
+# Headless state machine
+
+DIGITS = "0123456789"
+KEY_RUN_RE = re.compile(r"[0-9]+|\S")
+# Every key ``press`` and ``feed`` understand
+KEYS = frozenset(DIGITS + ".=Cc±~⌫<" + "".join(OPERATOR_ALIASES))
+
+
+class CalculatorState:
+    """The calculator's keypad logic without any widgets.
+
+    ``display`` and ``expression`` hold the text the UI shows in its display
+    and expression label; every ``*_pressed`` method mirrors one button.
+    Numbers are read, computed and shown by ``arithmetic``, one of the
+    ``ARITHMETICS`` backends.
+    """
+
+    __slots__ = ("display", "_expression", "first_number", "current_operator",
+                 "reset_on_next_digit", "_keymap", "arithmetic", "_shown")
+
+    def __init__(self, arithmetic=FLOAT):
+        self.arithmetic = arithmetic
+        # The last result as (display text, value), while it is on display
+        self._shown = None
+        self.display = ""
+        self._expression = ""
+        self.first_number = None
+        self.current_operator = None
+        self.reset_on_next_digit = False
+        self._keymap = self._build_keymap()
+
+    @property
+    def expression(self):
+        # Formatting the label on every operator dominates replay time, so
+        # operators store the raw parts and the text is built when read.
+        expression = self._expression
+        if isinstance(expression, tuple):
+            first, op, *second = expression
+            format_value = self.arithmetic.format
+            text = f"{format_value(first)} {op}"
+            if second:
+                text += f" {format_value(second[0])} ="
+            self._expression = expression = text
+        return expression
+
+    @expression.setter
+    def expression(self, text):
+        self._expression = text
+
+    def _build_keymap(self):
+        keymap = {
+            ".": self.decimal_pressed,
+            "=": self.equals_pressed,
+            "C": self.clear_pressed,
+            "c": self.clear_pressed,
+            "±": self.negate_pressed,
+            "~": self.negate_pressed,
+            "⌫": self.backspace_pressed,
+            "<": self.backspace_pressed,
+        }
+        for symbol, op in OPERATOR_ALIASES.items():
+            keymap[symbol] = lambda op=op: self.operator_pressed(op)
+        return keymap
+
+    def number_pressed(self, digit):
+        if self.reset_on_next_digit:
+            self.display = digit
+            self.reset_on_next_digit = False
+            self._shown = None
+        else:
+            self.display += digit
+
+    def decimal_pressed(self):
+        if '.' not in self.display:
+            self.display += '.'
+
+    def operator_pressed(self, op):
+        if self.display == '' and self.first_number is None:
+            return
+        # If chaining operations, compute the intermediate result first
+        if self.first_number is not None and self.current_operator and not self.reset_on_next_digit:
+            self.equals_pressed()
+        if self.display:
+            self.first_number = self.display_value()
+        self.current_operator = op
+        self._expression = (self.first_number, op)
+        self.reset_on_next_digit = True
+
+    def equals_pressed(self):
+        if self.first_number is None or self.current_operator is None:
+            return
+        if self.display == '':
+            return
+        second = self.display_value()
+        result = self.arithmetic.operations[self.current_operator](self.first_number, second)
+        if result == "Error":
+            self.division_error()
+            return
+        self._expression = (self.first_number, self.current_operator, second)
+        self.show_result(result)
+
+    def clear_pressed(self):
+        self.display = ""
+        self._shown = None
+        self.expression = ""
+        self.first_number = None
+        self.current_operator = None
+        self.reset_on_next_digit = False
+
+    def negate_pressed(self):
+        current = self.display
+        if current and current != '0':
+            if current.startswith('-'):
+                self.display = current[1:]
+            else:
+                self.display = '-' + current
+
+    def backspace_pressed(self):
+        self.display = self.display[:-1]
+
+    def evaluate_expression(self, text):
+        """Evaluate a full expression such as ``3 × (4 − 2) ÷ 7`` and show the result."""
+        try:
+            result = compile_expression(text, self.arithmetic).evaluate()
+        except ExpressionError:
+            self.expression = "Error: Invalid expression"
+            return
+        if result == "Error":
+            self.division_error()
+            return
+        self.expression = f"{text} ="
+        self.show_result(result)
+
+    def show_result(self, result):
+        self.display = self.arithmetic.format(result)
+        self._shown = (self.display, result)
+        self.first_number = result
+        self.current_operator = None
+        self.reset_on_next_digit = True
+
+    def display_value(self):
+        # A result still on the display is used as computed; its text may be
+        # rounded, as for 1/3 with fractions
+        shown = self._shown
+        if shown is not None and shown[0] == self.display:
+            return shown[1]
+        return self.arithmetic.parse(self.display)
+
+    def set_arithmetic(self, arithmetic):
+        """Switch backends; values of different backends do not mix, so this clears."""
+        self.clear_pressed()
+        self.arithmetic = arithmetic
+
+    def division_error(self):
+        self.expression = "Error: Division by zero"
+        self.display = ""
+        self.first_number = None
+        self.current_operator = None
+
+    def press(self, key):
+        """Press one key given by its button label (ASCII aliases allowed)."""
+        if key in DIGITS:
+            self.number_pressed(key)
+        elif key in self._keymap:
+            self._keymap[key]()
+        elif not key.isspace():
+            raise ValueError(f"Unknown key {key!r}")
+
+    def feed(self, keys):
+        """Press every key in ``keys``; whitespace is ignored.
+
+        Runs of digits are entered in one step, which is equivalent to
+        pressing them one at a time.
+        """
+        keymap = self._keymap
+        for key in KEY_RUN_RE.findall(keys):
+            if key[0] in DIGITS:
+                if self.reset_on_next_digit:
+                    self.display = key
+                    self.reset_on_next_digit = False
+                    self._shown = None
+                else:
+                    self.display += key
+            elif key in keymap:
+                keymap[key]()
+            else:
+                raise ValueError(f"Unknown key {key!r}")
+
+
+# Keystroke replay
+
+def replay(lines, arithmetic=FLOAT):
+    """Run each line as an independent keystroke script and yield the final display.
+
+    A script that cannot be completed (an unknown key, or an operator pressed
+    on a bare ``.``) yields ``"Error"`` instead of stopping the replay.
+    """
+    state = CalculatorState(arithmetic)
+    for line in lines:
+        state.clear_pressed()
+        try:
+            state.feed(line)
+        except ValueError:
+            yield "Error"
+            continue
+        yield state.display
+
+
+def batch_main(argv):
+    """Entry point for ``Calculator_Ryuu.py --batch [--arithmetic=NAME] [FILE]``.
+
+    Reads stdin without FILE or with ``-``; NAME is one of ``ARITHMETICS``.
+    """
+    arithmetic = FLOAT
+    paths = []
+    for arg in argv:
+        if arg.startswith("--arithmetic="):
+            arithmetic = ARITHMETICS.get(arg.partition("=")[2])
+        elif arg != "--batch":
+            paths.append(arg)
+    if len(paths) > 1 or arithmetic is None:
+        sys.stderr.write("usage: Calculator_Ryuu.py --batch "
+                         f"[--arithmetic={'|'.join(ARITHMETICS)}] [FILE|-]\n")
+        return 2
+    write = sys.stdout.write
+    if not paths or paths[0] == "-":
+        for display in replay(sys.stdin, arithmetic):
+            write(display + "\n")
+        return 0
+    with open(paths[0], encoding="utf-8") as source:
+        for display in replay(source, arithmetic):
+            write(display + "\n")
+    return 0
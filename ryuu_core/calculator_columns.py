@@ -0,0 +1,76 @@
+"""Column-at-a-time evaluation of ``(a, op, b)`` rows with NumPy.
+
+Results follow ``OPERATIONS``: division by zero is an error (``safe_divide``
+returns ``"Error"``), and ``format_column`` applies the ``format_number``
+display rule.
+"""
+import numpy as np
+
+from ryuu_core.calculator import OPERATIONS, OPERATOR_ALIASES, format_number
+
+# Operator codes follow the order of OPERATIONS: ÷ × − +
+OPERATOR_CODES = {symbol: code for code, symbol in enumerate(OPERATIONS)}
+DIVIDE, MULTIPLY, SUBTRACT, ADD = (OPERATOR_CODES[symbol] for symbol in "÷×−+")
+
+UFUNCS = {
+    MULTIPLY: np.multiply,
+    SUBTRACT: np.subtract,
+    ADD: np.add,
+}
+
+# Integral values inside this range format through int64 without a Python loop
+INT64_SAFE = 2.0 ** 63
+
+
+def encode_operators(symbols):
+    """Turn an array of operator symbols (ASCII aliases allowed) into int8 codes."""
+    symbols = np.asarray(symbols)
+    codes = np.full(symbols.shape, -1, dtype=np.int8)
+    for symbol, op in OPERATOR_ALIASES.items():
+        codes[symbols == symbol] = OPERATOR_CODES[op]
+    if (codes < 0).any():
+        unknown = symbols[codes < 0][0]
+        raise ValueError(f"Unknown operator {unknown!r}")
+    return codes
+
+
+def evaluate_columns(a, codes, b):
+    """Evaluate every row at once.
+
+    Returns ``(results, errors)``: a float64 array, and a boolean mask that is
+    True where ``safe_divide`` would have returned ``"Error"``. Errored rows
+    hold NaN in ``results``.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    codes = np.asarray(codes)
+    if codes.dtype.kind not in "iu":
+        codes = encode_operators(codes)
+    a, codes, b = np.broadcast_arrays(a, codes, b)
+    if ((codes < 0) | (codes >= len(OPERATIONS))).any():
+        raise ValueError("Operator codes must be between 0 and 3")
+
+    results = np.empty(a.shape, dtype=np.float64)
+    for code, ufunc in UFUNCS.items():
+        ufunc(a, b, out=results, where=codes == code)
+
+    divide = codes == DIVIDE
+    errors = divide & (b == 0)
+    np.divide(a, b, out=results, where=divide & ~errors)
+    results[errors] = np.nan
+    return results, errors
+
+
+def format_column(results, errors=None):
+    """Format results like ``format_number``, with ``"Error"`` for errored rows."""
+    results = np.asarray(results, dtype=np.float64)
+    text = results.astype(str).astype(object)
+    integral = np.isfinite(results) & (results == np.trunc(results))
+    small = integral & (np.abs(results) < INT64_SAFE)
+    text[small] = results[small].astype(np.int64).astype(str)
+    # Integral floats beyond int64 are rare; format them one at a time
+    for index in np.flatnonzero(integral & ~small):
+        text.flat[index] = format_number(float(results.flat[index]))
+    if errors is not None:
+        text[np.asarray(errors, dtype=bool)] = "Error"
+    return text
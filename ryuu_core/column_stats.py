@@ -0,0 +1,279 @@
+"""One-pass statistics over a column of numbers, in constant memory.
+
+``ColumnStats`` takes text a chunk at a time (a paste, a file or stdin) and
+keeps only running totals. It tracks count, a compensated sum, mean and
+variance (Welford's method, merged a chunk at a time), min and max, and a
+median. The median comes from a fixed-size uniform sample, so it is exact
+up to ``SAMPLE_SIZE`` values and approximate beyond that.
+
+Numbers are separated by whitespace, commas or semicolons. In a column, one
+number per line, commas can only be thousands separators: ``1,234.50`` is
+read as 1234.5, and any other token with a comma is skipped. Tokens that are
+not finite numbers, such as a column header, are counted in ``skipped``.
+
+    Calculator_Ryuu.py --stats [FILE|-]
+"""
+import math
+import re
+import sys
+from itertools import chain
+
+import numpy as np
+
+from ryuu_core.calculator import format_number
+
+SAMPLE_SIZE = 8192
+CHUNK_CHARS = 1 << 18
+# Separators become spaces; the display's minus sign is read as a hyphen
+COLUMN_SEPARATORS = str.maketrans({";": " ", "\t": " ", "\r": " ", "\n": " ",
+                                   "\f": " ", "\v": " ", "−": "-"})
+SEPARATORS = str.maketrans({",": " ", ";": " ", "\t": " ", "\r": " ", "\n": " ",
+                            "\f": " ", "\v": " ", "−": "-"})
+NUMBER_RE = re.compile(r"[-+−]?(?:\d{1,3}(?:,\d{3})+(?:\.\d*)?|\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+GROUPED_RE = re.compile(r"[-+]?\d{1,3}(?:,\d{3})+(?:\.\d*)?(?:[eE][-+]?\d+)?")
+# Lines checked by is_number_column
+COLUMN_PROBE_LINES = 8
+
+
+def is_number_column(text):
+    """True if ``text`` looks like a column of numbers, one per line, under an optional header."""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            lines.append(line)
+            if len(lines) == COLUMN_PROBE_LINES:
+                break
+    if lines and not NUMBER_RE.fullmatch(lines[0]):
+        del lines[0]
+    return len(lines) > 1 and all(NUMBER_RE.fullmatch(line) for line in lines)
+
+
+def ungroup(tokens):
+    """Drop the thousands separators from grouped numbers; other tokens with commas stay as they are."""
+    return [token.replace(",", "") if "," in token and GROUPED_RE.fullmatch(token) else token
+            for token in tokens]
+
+
+def file_chunks(file, chunk_chars=CHUNK_CHARS):
+    """Chunks of a text file, and whether they are a column of numbers (judged by the first)."""
+    first = file.read(chunk_chars)
+    return chain([first], iter(lambda: file.read(chunk_chars), "")), is_number_column(first)
+
+
+def to_floats(tokens):
+    """Convert tokens to a float64 array; returns ``(values, skipped)``."""
+    try:
+        values = np.array(tokens, dtype=np.float64)
+    except ValueError:
+        # Rare, so the slow path converts one token at a time
+        parsed = []
+        for token in tokens:
+            try:
+                parsed.append(float(token))
+            except ValueError:
+                pass
+        values = np.array(parsed, dtype=np.float64)
+    finite = np.isfinite(values)
+    if not finite.all():
+        values = values[finite]
+    return values, len(tokens) - len(values)
+
+
+class ColumnStats:
+    __slots__ = ("count", "skipped", "mean", "min", "max", "column", "_sum", "_compensation",
+                 "_m2", "_tail", "_sample", "_keys", "_rng")
+
+    def __init__(self, seed=0, column=False):
+        """With ``column`` the input has one number per line, so commas are thousands separators."""
+        self.count = 0
+        self.skipped = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.column = column
+        self._sum = 0.0
+        self._compensation = 0.0
+        self._m2 = 0.0
+        # An unfinished token from the end of the last chunk
+        self._tail = ""
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+        # Seeded, so the same input always gives the same median
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def sum(self):
+        return self._sum + self._compensation
+
+    @property
+    def variance(self):
+        """Sample variance; NaN for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def pvariance(self):
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self):
+        # Halving is exact, and keeps the mean of the middle two values
+        # from overflowing near the top of the float range
+        return float(np.median(self._sample * 0.5)) * 2 if self.count else math.nan
+
+    @property
+    def median_is_exact(self):
+        return self.count <= SAMPLE_SIZE
+
+    def feed(self, text):
+        """Add the numbers in a chunk of text; a number may continue into the next chunk."""
+        text = (self._tail + text).translate(COLUMN_SEPARATORS if self.column else SEPARATORS)
+        end = text.rfind(" ")
+        self._tail = text[end + 1:]
+        if end > 0:
+            tokens = text[:end].split()
+            self.update(ungroup(tokens) if self.column and "," in text else tokens)
+
+    def finish(self):
+        """Add the number held back at the end of the last chunk."""
+        if self._tail:
+            self.update(ungroup([self._tail]) if self.column else [self._tail])
+            self._tail = ""
+
+    def feed_file(self, file, chunk_chars=CHUNK_CHARS):
+        for chunk in iter(lambda: file.read(chunk_chars), ""):
+            self.feed(chunk)
+        self.finish()
+
+
+    def update(self, tokens):
+        """Add a list of number tokens."""
+        if not tokens:
+            return
+        values, skipped = to_floats(tokens)
+        self.skipped += skipped
+        n = len(values)
+        if not n:
+            return
+
+        # fsum is exact for the chunk; Neumaier's compensation carries what
+        # adding it to the running total rounds off
+        try:
+            chunk_sum = math.fsum(values.tolist())
+            chunk_mean = chunk_sum / n
+        except OverflowError:
+            # fsum gives up when a partial sum leaves the float range. The
+            # mean never does; the sum from it saturates to ±inf only when
+            # it is out of range itself
+            chunk_mean = math.fsum((values / n).tolist())
+            chunk_sum = chunk_mean * n
+        total = self._sum + chunk_sum
+        if not math.isfinite(total):
+            # Saturated; the compensation would only turn it into NaN
+            pass
+        elif abs(self._sum) >= abs(chunk_sum):
+            self._compensation += (self._sum - total) + chunk_sum
+        else:
+            self._compensation += (chunk_sum - total) + self._sum
+        self._sum = total
+
+        # Welford's update for a whole chunk: merge its mean and sum of
+        # squared deviations into the running ones (Chan et al.)
+        with np.errstate(over="ignore"):
+            deviations = values - chunk_mean
+            chunk_m2 = float(np.dot(deviations, deviations))
+        count = self.count + n
+        delta = chunk_mean - self.mean
+        # Weights first, so large values overflow only if the result does
+        self.mean += delta * (n / count)
+        self._m2 += chunk_m2 + delta * (self.count * n / count) * delta
+        self.count = count
+
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._add_to_sample(values)
+
+    def _add_to_sample(self, values):
+        # Every value gets a random key and the sample keeps the values with
+        # the SAMPLE_SIZE smallest keys, which is a uniform sample of all
+        # values seen so far
+        keys = self._rng.random(len(values))
+        if len(self._keys) == SAMPLE_SIZE:
+            candidates = keys < self._keys.max()
+            values = values[candidates]
+            keys = keys[candidates]
+        sample = np.concatenate((self._sample, values))
+        keys = np.concatenate((self._keys, keys))
+        if len(keys) > SAMPLE_SIZE:
+            keep = np.argpartition(keys, SAMPLE_SIZE)[:SAMPLE_SIZE]
+            sample = sample[keep]
+            keys = keys[keep]
+        self._sample = sample
+        self._keys = keys
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean if self.count else math.nan,
+            "variance": self.variance,
+            "stdev": self.stdev,
+            "min": self.min if self.count else math.nan,
+            "max": self.max if self.count else math.nan,
+            "median": self.median,
+            "median_exact": self.median_is_exact,
+            "skipped": self.skipped,
+        }
+
+    def describe(self):
+        """Two short lines for the calculator's expression label."""
+        if not self.count:
+            return "No numbers found"
+        median = "median" if self.median_is_exact else "median ≈"
+        return (f"n {self.count} · mean {short(self.mean)} · sd {short(self.stdev)}\n"
+                f"min {short(self.min)} · max {short(self.max)} · {median} {short(self.median)}")
+
+
+def short(value):
+    text = f"{value:.10g}"
+    # Past 1e16 the digits of a whole float are mostly noise
+    return format_number(float(text)) if abs(value) < 1e16 else text
+
+
+def read_stats(file):
+    chunks, column = file_chunks(file)
+    stats = ColumnStats(column=column)
+    for chunk in chunks:
+        stats.feed(chunk)
+    stats.finish()
+    return stats
+
+
+def stats_main(argv):
+    """Entry point for ``Calculator_Ryuu.py --stats [FILE]``; reads stdin without FILE or with ``-``."""
+    paths = [arg for arg in argv if arg != "--stats"]
+    if len(paths) > 1:
+        sys.stderr.write("usage: Calculator_Ryuu.py --stats [FILE|-]\n")
+        return 2
+    try:
+        if not paths or paths[0] == "-":
+            stats = read_stats(sys.stdin)
+        else:
+            with open(paths[0], encoding="utf-8") as source:
+                stats = read_stats(source)
+    except (OSError, ValueError, OverflowError) as error:
+        if isinstance(error, UnicodeDecodeError):
+            error = "not a text file"
+        elif isinstance(error, OSError) and error.strerror:
+            error = f"{error.filename}: {error.strerror}" if error.filename else error.strerror
+        sys.stderr.write(f"error: {error}\n")
+        return 1
+    for key, value in stats.summary().items():
+        if isinstance(value, float):
+            value = f"{value:.17g}"
+        sys.stdout.write(f"{key},{value}\n")
+    return 0
@@ -0,0 +1,220 @@
+"""Multi-user credential store with an in-memory index.
+
+Accounts live in two files: a compacted JSON snapshot (``filename``) and an
+append-only journal of changes next to it (``filename + ".log"``, one JSON
+object per line). Lookups are served from a dict that is rebuilt only when
+either file's mtime or size changes; when only the journal has grown, just
+the new lines are read. Writes append one journal line, and every
+``compact_every`` appended lines the journal is folded back into the
+snapshot.
+
+The legacy single-account snapshot (``{"User Login": [...], "Admin Login":
+[...]}``) is read as two accounts and rewritten in the new format at the
+next compaction.
+
+All public methods are thread-safe, so callers may run them from worker
+threads. Writers in different processes take an advisory lock on
+``filename + ".lock"`` around each append and compaction, so the journal
+offset this store keeps never skips or splits another process's lines.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+LEGACY_KEYS = {"User Login": False, "Admin Login": True}
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive advisory lock on ``path``, creating it if needed."""
+    with open(path, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            # msvcrt locks a byte range from the current position
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CredentialStore:
+
+    def __init__(self, filename, compact_every=1000):
+        self.filename = filename
+        self.journal = filename + ".log"
+        self.lock_file = filename + ".lock"
+        self.compact_every = compact_every
+        self.users = {}
+        self._snapshot_signature = None
+        self._journal_signature = None
+        self._journal_offset = 0
+        self._journal_lines = 0
+        self._lock = threading.RLock()
+
+    # Reading
+
+    def refresh(self):
+        """Bring the index up to date with the files; cheap when nothing changed."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        snapshot = _signature(self.filename)
+        journal = _signature(self.journal)
+        if snapshot == self._snapshot_signature and journal == self._journal_signature:
+            return
+        if snapshot != self._snapshot_signature or journal is None or journal[1] < self._journal_offset:
+            self._load_snapshot()
+            self._snapshot_signature = snapshot
+            self._journal_offset = 0
+            self._journal_lines = 0
+        self._read_journal()
+        self._journal_signature = _signature(self.journal)
+
+    def _load_snapshot(self):
+        self.users = {}
+        try:
+            with open(self.filename, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        if "users" in data:
+            self.users = data["users"]
+            return
+        for key, admin in LEGACY_KEYS.items():
+            if key in data:
+                username, password = data[key]
+                self.users[username] = {"password": password, "admin": admin}
+
+    def _read_journal(self):
+        try:
+            file = open(self.journal, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(self._journal_offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # A write still in progress; pick it up next time
+                    break
+                self._apply(json.loads(line))
+                self._journal_offset += len(line)
+                self._journal_lines += 1
+
+    def _apply(self, entry):
+        username = entry["username"]
+        if entry.get("deleted"):
+            self.users.pop(username, None)
+        else:
+            self.users[username] = {key: value for key, value in entry.items() if key != "username"}
+
+    def get(self, username):
+        with self._lock:
+            self._refresh()
+            return self.users.get(username)
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self.users)
+
+    # Writing
+
+    @contextmanager
+    def _writing(self):
+        # Under the file lock no other process can write, so after the
+        # refresh the journal ends exactly at _journal_offset
+        with self._lock, _file_lock(self.lock_file):
+            self._refresh()
+            yield
+
+    def put(self, username, **record):
+        with self._writing():
+            self._append({"username": username, **record})
+
+    def add(self, username, **record):
+        """Like ``put`` but only for a new username; returns False if it is taken."""
+        with self._writing():
+            if username in self.users:
+                return False
+            self._append({"username": username, **record})
+            return True
+
+    def add_many(self, accounts):
+        """Add ``(username, record)`` pairs in one journal write.
+
+        Returns one bool per pair, False where the username was already
+        taken (including by an earlier pair in the same call).
+        """
+        with self._writing():
+            entries = []
+            claimed = set()
+            added = []
+            for username, record in accounts:
+                is_new = username not in self.users and username not in claimed
+                if is_new:
+                    claimed.add(username)
+                    entries.append({"username": username, **record})
+                added.append(is_new)
+            if entries:
+                self._append(*entries)
+            return added
+
+    def delete(self, username):
+        with self._writing():
+            self._append({"username": username, "deleted": True})
+
+    def _append(self, *entries):
+        data = b"".join((json.dumps(entry, separators=(",", ":")) + "\n").encode()
+                        for entry in entries)
+        with open(self.journal, "ab") as file:
+            file.write(data)
+        for entry in entries:
+            self._apply(entry)
+        self._journal_offset += len(data)
+        self._journal_lines += len(entries)
+        self._journal_signature = _signature(self.journal)
+        if self._journal_lines >= self.compact_every:
+            self._compact()
+
+    def compact(self):
+        """Fold the journal into the snapshot and empty the journal."""
+        with self._writing():
+            self._compact()
+
+    def _compact(self):
+        temporary = self.filename + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump({"users": self.users}, file)
+        os.replace(temporary, self.filename)
+        with open(self.journal, "wb"):
+            pass
+        self._snapshot_signature = _signature(self.filename)
+        self._journal_signature = _signature(self.journal)
+        self._journal_offset = 0
+        self._journal_lines = 0
@@ -0,0 +1,181 @@
+"""Low-overhead call latency instrumentation.
+
+Decorate a function with ``@timed`` to record how long each call takes in a
+fixed-bucket histogram per function, plus a ring buffer of the most recent
+calls across all functions.
+
+Instrumentation is controlled by the ``RYUU_INSTRUMENT`` environment
+variable, read once at import:
+
+* unset or ``0``: ``timed`` returns the function unchanged, so there is no
+  overhead at all.
+* ``1``: every call is timed.
+* a fraction such as ``0.1``: roughly that share of calls is timed.
+
+When enabled, stats are printed to stderr at exit, or written as JSON to the
+path in ``RYUU_INSTRUMENT_JSON`` if that is set. ``set_sample_rate``,
+``stats``, ``dump`` and ``export_json`` can also be called directly.
+"""
+import atexit
+import functools
+import itertools
+import json
+import os
+import sys
+from time import perf_counter_ns
+
+# Each power of two is split into 2 ** SUB_BITS buckets (about 19% wide)
+SUB_BITS = 2
+SUB_MASK = (1 << SUB_BITS) - 1
+BUCKETS = 64 << SUB_BITS
+RECENT_CALLS = 1024
+
+
+def bucket_index(ns):
+    bits = ns.bit_length()
+    if bits <= SUB_BITS:
+        return ns
+    return ((bits - SUB_BITS) << SUB_BITS) + ((ns >> (bits - 1 - SUB_BITS)) & SUB_MASK)
+
+
+def bucket_upper_bound(index):
+    if index < 1 << SUB_BITS:
+        return index + 1
+    bits = (index >> SUB_BITS) + SUB_BITS
+    width = 1 << (bits - 1 - SUB_BITS)
+    return (1 << (bits - 1)) + (index & SUB_MASK) * width + width
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, fraction):
+        """Upper bound, in ns, of the bucket holding the given fraction of calls."""
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+
+class RingBuffer:
+    """Fixed-size buffer of recent items; writers never take a lock."""
+
+    __slots__ = ("slots", "sequence", "size")
+
+    def __init__(self, size=RECENT_CALLS):
+        self.slots = [None] * size
+        self.sequence = itertools.count()
+        self.size = size
+
+    def append(self, item):
+        # next() on itertools.count is atomic under the GIL
+        position = next(self.sequence)
+        self.slots[position % self.size] = (position, item)
+
+    def items(self):
+        return [item for _, item in sorted(slot for slot in self.slots if slot is not None)]
+
+
+def _parse_rate(value):
+    try:
+        rate = float(value or 0)
+    except ValueError:
+        rate = 1.0
+    return min(max(rate, 0.0), 1.0)
+
+
+SAMPLE_RATE = _parse_rate(os.environ.get("RYUU_INSTRUMENT"))
+ENABLED = SAMPLE_RATE > 0
+_sample_every = max(1, round(1 / SAMPLE_RATE)) if ENABLED else 1
+histograms = {}
+recent = RingBuffer()
+
+
+def set_sample_rate(rate):
+    """Time about ``rate`` of calls to already-instrumented functions (0 pauses timing)."""
+    global _sample_every
+    _sample_every = max(1, round(1 / rate)) if rate > 0 else 0
+
+
+def timed(func):
+    if not ENABLED:
+        return func
+    name = func.__qualname__
+    histogram = histograms.setdefault(name, Histogram())
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        every = _sample_every
+        if not every or next(calls) % every:
+            return func(*args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = perf_counter_ns() - start
+            histogram.record(duration)
+            recent.append((name, start, duration))
+
+    return wrapper
+
+
+def stats():
+    """Return ``{name: {count, mean_ms, p50_ms, p99_ms, max_ms}}`` for every timed function."""
+    result = {}
+    for name, histogram in histograms.items():
+        if not histogram.count:
+            continue
+        result[name] = {
+            "count": histogram.count,
+            "mean_ms": histogram.total / histogram.count / 1e6,
+            "p50_ms": histogram.percentile(0.50) / 1e6,
+            "p99_ms": histogram.percentile(0.99) / 1e6,
+            "max_ms": histogram.max / 1e6,
+        }
+    return result
+
+
+def dump(file=None):
+    file = file or sys.stderr
+    print(f"{'function':<40} {'count':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}", file=file)
+    for name, row in sorted(stats().items()):
+        print(f"{name:<40} {row['count']:>8} {row['p50_ms']:>9.3f} "
+              f"{row['p99_ms']:>9.3f} {row['max_ms']:>9.3f}", file=file)
+
+
+def export_json(path):
+    recent_calls = [{"function": name, "start_ns": start, "duration_ns": duration}
+                    for name, start, duration in recent.items()]
+    with open(path, "w") as file:
+        json.dump({"stats": stats(), "recent": recent_calls}, file, indent=2)
+
+
+def _report_at_exit():
+    path = os.environ.get("RYUU_INSTRUMENT_JSON")
+    if path:
+        export_json(path)
+    elif any(histogram.count for histogram in histograms.values()):
+        dump()
+
+
+if ENABLED:
+    atexit.register(_report_at_exit)
@@ -0,0 +1,48 @@
+"""scrypt password hashing.
+
+Hashes are stored as ``scrypt$<n>$<r>$<p>$<salt>$<key>`` with base64 salt
+and key, so the cost can be raised later without invalidating old hashes.
+``SCRYPT_N`` is the tunable cost; ``benchmarks/bench_password_cost.py``
+reports its latency on the current machine.
+"""
+import base64
+import hashlib
+import hmac
+import os
+
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _scrypt(password, salt, n, r, p):
+    # scrypt needs 128 * r * n bytes; leave headroom over the 32 MiB default
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * r * n + 2 ** 20, dklen=KEY_BYTES)
+
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, n, r, p)
+    return "$".join(("scrypt", str(n), str(r), str(p),
+                     base64.b64encode(salt).decode(), base64.b64encode(key).decode()))
+
+
+def verify_password(password, encoded):
+    try:
+        scheme, n, r, p, salt, key = encoded.split("$")
+    except ValueError:
+        return False
+    if scheme != "scrypt":
+        return False
+    expected = base64.b64decode(key)
+    return hmac.compare_digest(_scrypt(password, base64.b64decode(salt), int(n), int(r), int(p)),
+                               expected)
+
+
+def needs_rehash(encoded, n=SCRYPT_N):
+    """True when ``encoded`` was made with a different cost than ``n``."""
+    parts = encoded.split("$")
+    return len(parts) != 6 or parts[0] != "scrypt" or int(parts[1]) != n
@@ -0,0 +1,208 @@
+"""Polygons with any number of vertices, stored as one NumPy array.
+
+Area (shoelace formula), perimeter and the convex hull are computed with
+whole-array operations, so outlines with millions of vertices never go
+through a Python loop per vertex.
+
+    python -m ryuu_core.polygon OUTLINE [--hull]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from ryuu_core.shapes import Shape
+
+
+class Polygon(Shape):
+    __slots__ = ("vertices",)
+
+    def __init__(self, vertices):
+        vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        if vertices.ndim != 2 or vertices.shape[1] != 2:
+            raise ValueError("Polygon vertices must be an (n, 2) array")
+        if len(vertices) < 3:
+            raise ValueError("A polygon needs at least 3 vertices")
+        self.vertices = vertices
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_vertices(path))
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def _centered(self):
+        # Survey coordinates are large and close together; measuring from the
+        # first vertex keeps the shoelace products from cancelling
+        origin = self.vertices[0]
+        return self.vertices[:, 0] - origin[0], self.vertices[:, 1] - origin[1]
+
+    def area(self):
+        x, y = self._centered()
+        # Sum of x[i] * y[i+1] - x[i+1] * y[i], wrapping around at the end
+        twice = np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]) + x[-1] * y[0] - x[0] * y[-1]
+        return abs(float(twice)) / 2
+
+    def perimeter(self):
+        x, y = self._centered()
+        return float(np.hypot(np.diff(x, append=x[0]), np.diff(y, append=y[0])).sum())
+
+    def convex_indices(self):
+        """If the outline is already convex, its corner indices counter-clockwise, else None.
+
+        Vertices where the outline runs straight on are left out.
+        """
+        x, y = self._centered()
+        dx = np.diff(x, append=x[0])
+        dy = np.diff(y, append=y[0])
+        # Turn at each vertex, from the edge arriving at it to the one leaving
+        dx_in = np.roll(dx, 1)
+        dy_in = np.roll(dy, 1)
+        cross = dx_in * dy - dy_in * dx
+        if not ((cross >= 0).all() or (cross <= 0).all()):
+            return None
+        # Turning one way only is not enough: a star turns all the way round
+        # more than once
+        winding = np.arctan2(cross, dx_in * dx + dy_in * dy).sum()
+        if abs(abs(winding) - 2 * np.pi) > 1e-6:
+            return None
+        corners = np.flatnonzero(cross)
+        return corners if winding > 0 else corners[::-1]
+
+    def convex_hull(self):
+        """Return the convex hull as a new counter-clockwise ``Polygon``."""
+        # A convex outline is its own hull, found in one pass instead of the
+        # rounds quickhull needs when every vertex is on the hull
+        indices = self.convex_indices()
+        if indices is None:
+            indices = convex_hull_indices(self.vertices)
+        return Polygon(self.vertices[indices])
+
+
+def _cross(origin, end, points):
+    """Cross product of ``end - origin`` with ``points - origin``, row by row."""
+    return ((end[..., 0] - origin[..., 0]) * (points[..., 1] - origin[..., 1])
+            - (end[..., 1] - origin[..., 1]) * (points[..., 0] - origin[..., 0]))
+
+
+def convex_hull_indices(points):
+    """Indices of the convex hull vertices of ``points``, counter-clockwise.
+
+    Quickhull, run on every hull edge at once: each round finds the
+    farthest outside point of every edge, splits the edges there and drops
+    the points that fall inside. Each round is a few passes over the
+    remaining points, and the number of rounds grows with the log of the
+    hull size.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    points = points - points[0]
+    # Start from the lowest and highest points in (x, y) order; a full sort
+    # would cost more than all the rounds together
+    x = points[:, 0]
+    lowest = np.flatnonzero(x == x.min())
+    highest = np.flatnonzero(x == x.max())
+    # chain lists hull vertices in order; edge i runs from chain[i] to chain[i + 1]
+    chain = np.array([lowest[np.argmin(points[lowest, 1])],
+                      highest[np.argmax(points[highest, 1])]])
+    if np.array_equal(points[chain[0]], points[chain[1]]):
+        return chain[:1]
+
+    # Points right of the lowest-to-highest line lie outside edge 0, points
+    # left of it outside edge 1, which runs back
+    side = _cross(points[chain[0]], points[chain[1]], points)
+    candidates = np.flatnonzero(side != 0)
+    edges = (side[candidates] > 0).astype(np.intp)
+    distance = np.abs(side[candidates])
+
+    while len(candidates):
+        size = len(chain)
+        candidate_points = points[candidates]
+        start = points[chain[edges]]
+        end = points[chain[(edges + 1) % size]]
+
+        # The farthest candidate of each edge becomes a hull vertex. Of
+        # equally far ones take the one furthest along the edge, so points
+        # between them never do.
+        farthest = np.zeros(size)
+        np.maximum.at(farthest, edges, distance)
+        chosen = distance == farthest[edges]
+        if np.count_nonzero(chosen) > np.count_nonzero(farthest):
+            direction = end - start
+            offset = candidate_points - start
+            along = np.where(chosen, direction[:, 0] * offset[:, 0] + direction[:, 1] * offset[:, 1],
+                             -np.inf)
+            furthest = np.full(size, -np.inf)
+            np.maximum.at(furthest, edges, along)
+            chosen &= along == furthest[edges]
+        far = np.full(size, -1, dtype=np.intp)
+        far[edges[chosen]] = candidates[chosen]
+
+        # Insert each new vertex after the start of its edge
+        split = far >= 0
+        inserted = split.astype(np.intp)
+        position = np.arange(size) + np.cumsum(inserted) - inserted
+        new_chain = np.empty(size + int(inserted.sum()), dtype=np.intp)
+        new_chain[position] = chain
+        new_chain[position[split] + 1] = far[split]
+
+        # Every candidate's edge was split; keep those outside one of the
+        # two edges that replace it
+        apex = points[far[edges]]
+        before = -_cross(start, apex, candidate_points)
+        after = -_cross(apex, end, candidate_points)
+        outside_before = before > 0
+        outside_after = ~outside_before & (after > 0)
+        keep = outside_before | outside_after
+        chain = new_chain
+        candidates = candidates[keep]
+        distance = np.where(outside_before, before, after)[keep]
+        edges = (position[edges] + outside_after)[keep]
+    return chain
+
+
+def load_vertices(path):
+    """Read an ``(n, 2)`` vertex array from a ``.npy`` file or an ``x,y`` text file.
+
+    ``.npy`` files are memory-mapped. Text files hold one vertex per line,
+    separated by a comma or whitespace; ``#`` comments and a header line are
+    skipped.
+    """
+    if os.path.splitext(path)[1].lower() == ".npy":
+        return np.load(path, mmap_mode="r")
+    skip = 0
+    delimiter = None
+    with open(path, encoding="utf-8") as file:
+        # Only the first data line is parsed here; loadtxt reads the rest in C
+        for number, line in enumerate(file, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            delimiter = "," if "," in line else None
+            try:
+                [float(value) for value in line.split(delimiter)]
+            except ValueError:
+                skip = number
+            break
+    return np.loadtxt(path, delimiter=delimiter, comments="#", skiprows=skip,
+                      ndmin=2, dtype=np.float64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ryuu_core.polygon",
+                                     description="Area and perimeter of a polygon outline")
+    parser.add_argument("outline", help=".npy file or x,y text file")
+    parser.add_argument("--hull", action="store_true", help="measure the convex hull instead")
+    args = parser.parse_args(argv)
+
+    polygon = Polygon.from_file(args.outline)
+    if args.hull:
+        polygon = polygon.convex_hull()
+    print(f"vertices,{len(polygon)}")
+    print(f"area,{polygon.area():.17g}")
+    print(f"perimeter,{polygon.perimeter():.17g}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Struct-of-arrays storage and vectorized area/perimeter for many shapes.
+
+The formulas match the ``Shape`` classes in ``ryuu_core.shapes``; the
+difference is that a whole column of shapes is computed per NumPy call.
+"""
+import numpy as np
+
+from ryuu_core.shapes import SHAPES
+
+# Kind codes follow the order of SHAPES
+KIND_CODES = {kind: code for code, kind in enumerate(SHAPES)}
+MAX_FIELDS = max(len(cls.__slots__) for cls in SHAPES.values())
+
+
+def rectangle_kernel(width, height):
+    return width * height, 2 * (width + height), None
+
+
+def circle_kernel(radius):
+    return np.pi * radius ** 2, 2 * np.pi * radius, None
+
+
+def triangle_kernel(side1, side2, side3):
+    # Heron's formula; a negative product is an impossible triangle, which
+    # Triangle.area() reports by raising from math.sqrt
+    s = (side1 + side2 + side3) / 2
+    product = s * (s - side1) * (s - side2) * (s - side3)
+    valid = product >= 0
+    area = np.sqrt(product, out=np.full_like(product, np.nan), where=valid)
+    return area, side1 + side2 + side3, valid
+
+
+KERNELS = {
+    "rectangle": rectangle_kernel,
+    "circle": circle_kernel,
+    "triangle": triangle_kernel,
+}
+
+
+class ShapeBatch:
+    """Shape parameters kept as one contiguous float64 array per parameter.
+
+    ``columns[kind]`` holds one array per entry of the kind's ``__slots__``
+    and ``rows[kind]`` the position of each of those shapes in the original
+    input, so results can be returned in input order.
+    """
+
+    __slots__ = ("columns", "rows", "size")
+
+    def __init__(self, columns, rows=None):
+        self.columns = {}
+        self.rows = {}
+        offset = 0
+        for kind, params in columns.items():
+            fields = SHAPES[kind].__slots__
+            if len(params) != len(fields):
+                raise ValueError(f"{kind} takes {len(fields)} parameters, got {len(params)}")
+            arrays = tuple(np.ascontiguousarray(param, dtype=np.float64) for param in params)
+            count = len(arrays[0])
+            if any(len(array) != count for array in arrays):
+                raise ValueError(f"{kind} parameter columns differ in length")
+            self.columns[kind] = arrays
+            if rows is None:
+                self.rows[kind] = np.arange(offset, offset + count)
+            else:
+                self.rows[kind] = np.asarray(rows[kind], dtype=np.int64)
+            offset += count
+        self.size = offset
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        """Build a batch from ``Shape`` instances."""
+        kind_of = {shape_cls: kind for kind, shape_cls in SHAPES.items()}
+        values = {kind: [] for kind in SHAPES}
+        rows = {kind: [] for kind in SHAPES}
+        for row, shape in enumerate(shapes):
+            kind = kind_of[type(shape)]
+            values[kind].append([getattr(shape, field) for field in shape.__slots__])
+            rows[kind].append(row)
+        columns = {}
+        for kind, shape_cls in SHAPES.items():
+            table = np.array(values[kind], dtype=np.float64).reshape(-1, len(shape_cls.__slots__))
+            columns[kind] = tuple(table.T)
+        return cls(columns, rows)
+
+    @classmethod
+    def from_records(cls, codes, params):
+        """Build a batch from a kind-code array and an ``(n, MAX_FIELDS)`` parameter table.
+
+        Unused trailing parameters of a row are ignored.
+        """
+        codes = np.asarray(codes)
+        params = np.asarray(params, dtype=np.float64)
+        columns = {}
+        rows = {}
+        for kind, code in KIND_CODES.items():
+            selected = np.flatnonzero(codes == code)
+            columns[kind] = tuple(params[selected, field]
+                                  for field in range(len(SHAPES[kind].__slots__)))
+            rows[kind] = selected
+        if sum(len(selected) for selected in rows.values()) != len(codes):
+            raise ValueError("Unknown shape kind code")
+        return cls(columns, rows)
+
+    def __len__(self):
+        return self.size
+
+    def compute_by_kind(self):
+        """Return ``{kind: (areas, perimeters, valid)}``; ``valid`` is None when always valid."""
+        return {kind: KERNELS[kind](*params) for kind, params in self.columns.items()}
+
+    def compute(self):
+        """Return ``(areas, perimeters, valid)`` arrays in input order.
+
+        Invalid triangles have a NaN area and False in ``valid``.
+        """
+        areas = np.empty(self.size)
+        perimeters = np.empty(self.size)
+        valid = np.ones(self.size, dtype=bool)
+        for kind, (area, perimeter, ok) in self.compute_by_kind().items():
+            rows = self.rows[kind]
+            areas[rows] = area
+            perimeters[rows] = perimeter
+            if ok is not None:
+                valid[rows] = ok
+        return areas, perimeters, valid
@@ -0,0 +1,225 @@
+"""Chunked area/perimeter processing for shape files too large to load at once.
+
+Two input formats are read:
+
+* CSV, one shape per line: ``kind,param[,param...]`` with ``kind`` one of
+  the names in ``SHAPES`` and the parameters in ``__slots__`` order, e.g.
+  ``triangle,3,4,5``. Blank lines and lines starting with ``#`` are skipped.
+* Binary: the ``MAGIC`` header followed by packed ``RECORD_DTYPE`` records,
+  read through ``mmap`` so only the chunk being processed is paged in.
+  ``write_binary`` produces it.
+
+Output is CSV with ``area,perimeter`` per input shape, in input order;
+impossible triangles get ``nan`` as their area.
+"""
+import argparse
+import csv
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+import numpy as np
+
+from ryuu_core.shape_batch import KIND_CODES, MAX_FIELDS, ShapeBatch
+from ryuu_core.shapes import SHAPES
+
+MAGIC = b"RYSHAPE1"
+RECORD_DTYPE = np.dtype([("kind", "<u4"), ("params", "<f8", (MAX_FIELDS,))])
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def compute_chunk(codes, params):
+    return ShapeBatch.from_records(codes, params).compute()
+
+
+def write_binary(path, codes, params):
+    """Write kind codes and an ``(n, MAX_FIELDS)`` parameter table as a binary shape file."""
+    records = np.empty(len(codes), dtype=RECORD_DTYPE)
+    records["kind"] = codes
+    records["params"] = params
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        records.tofile(file)
+
+
+def is_binary(path):
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+# Binary input
+
+def binary_record_count(path):
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            payload = len(data) - len(MAGIC)
+    if payload % RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: truncated record at end of file")
+    return payload // RECORD_DTYPE.itemsize
+
+
+def compute_binary_range(path, start, stop):
+    """Compute records ``start:stop`` of a binary file; workers call this so only offsets are pickled."""
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            records = np.frombuffer(data, dtype=RECORD_DTYPE, count=stop - start,
+                                    offset=len(MAGIC) + start * RECORD_DTYPE.itemsize)
+            result = compute_chunk(records["kind"], records["params"])
+            # Drop the views into the map before it is closed
+            del records
+    return result
+
+
+def read_binary_range(path, start, stop):
+    """Kind codes and parameters of records ``start:stop``, copied out of the map."""
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            records = np.frombuffer(data, dtype=RECORD_DTYPE, count=stop - start,
+                                    offset=len(MAGIC) + start * RECORD_DTYPE.itemsize)
+            codes = records["kind"].copy()
+            params = records["params"].copy()
+            del records
+    return codes, params
+
+
+def binary_ranges(path, chunk_size):
+    total = binary_record_count(path)
+    for start in range(0, total, chunk_size):
+        yield path, start, min(start + chunk_size, total)
+
+
+# CSV input
+
+def parse_csv_rows(rows, first_line=1):
+    """Parse CSV rows into ``(codes, params)`` arrays."""
+    codes = []
+    params = []
+    for line, row in enumerate(rows, first_line):
+        if not row or row[0].lstrip().startswith("#"):
+            continue
+        kind = row[0].strip().lower()
+        if kind not in KIND_CODES:
+            raise ValueError(f"line {line}: unknown shape {row[0]!r}")
+        try:
+            values = [float(value) for value in row[1:]]
+        except ValueError:
+            raise ValueError(f"line {line}: invalid number in {row!r}") from None
+        fields = len(SHAPES[kind].__slots__)
+        if len(values) != fields:
+            raise ValueError(f"line {line}: {kind} takes {fields} parameters, got {len(values)}")
+        values += [0.0] * (MAX_FIELDS - fields)
+        codes.append(KIND_CODES[kind])
+        params.append(values)
+    return (np.array(codes, dtype=np.uint32),
+            np.array(params, dtype=np.float64).reshape(-1, MAX_FIELDS))
+
+
+def csv_chunks(file, chunk_size):
+    reader = csv.reader(file)
+    line = 1
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        yield parse_csv_rows(rows, line)
+        line += len(rows)
+
+
+# Pipeline
+
+def iter_results(path, chunk_size=DEFAULT_CHUNK_SIZE, workers=0):
+    """Yield ``(areas, perimeters, valid)`` per chunk of ``path``, in input order.
+
+    With ``workers`` > 0 chunks are computed in a process pool; at most two
+    chunks per worker are in flight, so memory stays bounded.
+    """
+    binary = is_binary(path)
+    if workers <= 0:
+        if binary:
+            for chunk in binary_ranges(path, chunk_size):
+                yield compute_binary_range(*chunk)
+        else:
+            with open(path, newline="") as file:
+                for codes, params in csv_chunks(file, chunk_size):
+                    yield compute_chunk(codes, params)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if binary:
+            submissions = (pool.submit(compute_binary_range, *chunk)
+                           for chunk in binary_ranges(path, chunk_size))
+            yield from _ordered(submissions, workers * 2)
+        else:
+            with open(path, newline="") as file:
+                submissions = (pool.submit(compute_chunk, codes, params)
+                               for codes, params in csv_chunks(file, chunk_size))
+                yield from _ordered(submissions, workers * 2)
+
+
+def iter_records(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield ``(codes, params)`` per chunk of ``path``, in input order."""
+    if is_binary(path):
+        for chunk in binary_ranges(path, chunk_size):
+            yield read_binary_range(*chunk)
+    else:
+        with open(path, newline="") as file:
+            yield from csv_chunks(file, chunk_size)
+
+
+def _ordered(submissions, window):
+    # Futures are resolved in submission order; the window caps how far
+    # submission runs ahead of the consumer
+    pending = deque()
+    for future in submissions:
+        pending.append(future)
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_results(results, out):
+    out.write("area,perimeter\n")
+    for areas, perimeters, _valid in results:
+        np.savetxt(out, np.column_stack((areas, perimeters)), fmt="%.17g", delimiter=",")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="PySide Shape Calc.py --batch",
+        description="Compute area and perimeter for every shape in a CSV or binary shape file.",
+    )
+    parser.add_argument("input", help="CSV or binary shape file")
+    parser.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="process pool size; 0 computes in this process")
+    args = parser.parse_args([arg for arg in (argv or sys.argv[1:]) if arg != "--batch"])
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    results = iter_results(args.input, args.chunk_size, args.workers)
+    # Output goes to a temporary file first, so a failed run leaves no
+    # partial CSV behind
+    temporary = args.output + ".tmp" if args.output else None
+    try:
+        # Reading the first chunk before writing anything reports an
+        # unreadable input without a stray header on stdout
+        first = next(results, None)
+        results = chain([] if first is None else [first], results)
+        if temporary:
+            with open(temporary, "w", newline="") as out:
+                write_results(results, out)
+            os.replace(temporary, args.output)
+        else:
+            write_results(results, sys.stdout)
+    except (OSError, ValueError) as error:
+        if temporary and os.path.exists(temporary):
+            os.remove(temporary)
+        if isinstance(error, OSError) and error.strerror:
+            error = f"{error.filename}: {error.strerror}" if error.filename else error.strerror
+        parser.exit(1, f"error: {error}\n")
+    return 0
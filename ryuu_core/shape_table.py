@@ -0,0 +1,139 @@
+"""Columnar results table for bulk shape calculations.
+
+``ResultTable`` stores a shape list and its results as one NumPy array per
+column, growing them as chunks arrive from ``shape_stream.iter_records``.
+Sorting and filtering never move rows. They produce an array of row
+numbers, and each sort order and each kind's rows are computed once and
+cached until more rows arrive. ``write_csv`` exports any such selection a
+chunk at a time.
+"""
+import numpy as np
+
+from ryuu_core.shape_batch import KIND_CODES, MAX_FIELDS
+from ryuu_core.shapes import SHAPES
+
+COLUMNS = ("row", "shape", "parameters", "area", "perimeter")
+EXPORT_CHUNK_ROWS = 65536
+# Kind name and parameter count by kind code
+KIND_NAMES = tuple(KIND_CODES)
+FIELD_COUNTS = tuple(len(SHAPES[kind].__slots__) for kind in KIND_NAMES)
+# Position of each kind code when kinds are sorted by name
+_NAME_RANKS = np.argsort(np.argsort(KIND_NAMES))
+
+
+class ResultTable:
+    __slots__ = ("size", "codes", "params", "areas", "perimeters", "valid",
+                 "_orders", "_kind_rows")
+
+    def __init__(self):
+        self.size = 0
+        self.codes = np.empty(0, dtype=np.uint32)
+        self.params = np.empty((0, MAX_FIELDS))
+        self.areas = np.empty(0)
+        self.perimeters = np.empty(0)
+        self.valid = np.empty(0, dtype=bool)
+        self._orders = {}
+        self._kind_rows = {}
+
+    def __len__(self):
+        return self.size
+
+    def append(self, codes, params, areas, perimeters, valid):
+        """Add a chunk of shapes and their results after the existing rows."""
+        start = self.size
+        end = start + len(codes)
+        if end > len(self.codes):
+            self._grow(end)
+        self.codes[start:end] = codes
+        self.params[start:end] = params
+        self.areas[start:end] = areas
+        self.perimeters[start:end] = perimeters
+        self.valid[start:end] = valid
+        self.size = end
+        self._orders.clear()
+        self._kind_rows.clear()
+
+    def _grow(self, needed):
+        # Doubling keeps the total copying proportional to the final size
+        capacity = max(needed, 2 * len(self.codes), 1024)
+        for name in ("codes", "params", "areas", "perimeters", "valid"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def kind(self, row):
+        return KIND_NAMES[self.codes[row]]
+
+    def parameters(self, row):
+        """The row's parameters, without the unused trailing fields."""
+        return self.params[row, :FIELD_COUNTS[self.codes[row]]].tolist()
+
+    def sort_order(self, column, descending=False):
+        """Row numbers sorted by ``column``. Ties keep input order and NaN areas sort last."""
+        order = self._orders.get((column, descending))
+        if order is None:
+            size = self.size
+            # Negating the keys sorts descending while keeping the sort stable
+            sign = -1 if descending else 1
+            if column == "row":
+                order = np.arange(size)
+                if descending:
+                    order = order[::-1]
+            elif column == "shape":
+                order = np.argsort(sign * _NAME_RANKS[self.codes[:size]], kind="stable")
+            elif column == "parameters":
+                # By kind, then by first parameter
+                order = np.lexsort((sign * self.params[:size, 0],
+                                    sign * _NAME_RANKS[self.codes[:size]]))
+            elif column == "area":
+                order = np.argsort(sign * self.areas[:size], kind="stable")
+            elif column == "perimeter":
+                order = np.argsort(sign * self.perimeters[:size], kind="stable")
+            else:
+                raise ValueError(f"Unknown column {column!r}")
+            self._orders[column, descending] = order
+        return order
+
+    def kind_rows(self, kind):
+        """Row numbers of the shapes of ``kind``, in input order."""
+        rows = self._kind_rows.get(kind)
+        if rows is None:
+            rows = self._kind_rows[kind] = np.flatnonzero(self.codes[:self.size] == KIND_CODES[kind])
+        return rows
+
+    def select(self, column=None, descending=False, kind=None):
+        """Row numbers to show: the shapes of ``kind`` (all if None), sorted by ``column``.
+
+        Without a column, rows stay in input order.
+        """
+        if column is None:
+            return np.arange(self.size) if kind is None else self.kind_rows(kind)
+        rows = self.sort_order(column, descending)
+        if kind is not None:
+            rows = rows[self.codes[rows] == KIND_CODES[kind]]
+        return rows
+
+    def write_csv(self, out, rows=None, chunk_rows=EXPORT_CHUNK_ROWS):
+        """Write ``rows`` (all rows if None), in that order, as CSV to a text file."""
+        out.write(",".join(["row", "shape"] + [f"param{field + 1}" for field in range(MAX_FIELDS)]
+                           + ["area", "perimeter"]) + "\n")
+        total = self.size if rows is None else len(rows)
+        for start in range(0, total, chunk_rows):
+            stop = min(start + chunk_rows, total)
+            chunk = np.arange(start, stop) if rows is None else rows[start:stop]
+            codes = self.codes[chunk].tolist()
+            columns = [(chunk + 1).tolist(), *self.params[chunk].T.tolist(),
+                       self.areas[chunk].tolist(), self.perimeters[chunk].tolist()]
+            out.writelines([LINE_FORMATS[code] % values
+                            for code, values in zip(codes, zip(*columns))])
+
+
+def _line_format(kind, fields):
+    # Row number, kind, parameters, area and perimeter, floats in full
+    # precision; "%.0s" takes an unused parameter and writes nothing
+    params = ["%r" if field < fields else "%.0s" for field in range(MAX_FIELDS)]
+    return ",".join(["%d", kind, *params, "%r", "%r"]) + "\n"
+
+
+LINE_FORMATS = [_line_format(kind, fields) for kind, fields in zip(KIND_NAMES, FIELD_COUNTS)]
@@ -0,0 +1,86 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import importlib
+import math
+import os
+
+# Every Shape subclass by lowercase class name, in definition order
+REGISTRY = {}
+
+class Shape(ABC):
+    __slots__ = ()
+    # Input field labels, one per constructor parameter in __slots__ order;
+    # empty for shapes that are not entered as a form of numbers
+    fields = ()
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        REGISTRY[cls.__name__.lower()] = cls
+    @abstractmethod
+    def area(self):
+        pass
+    @abstractmethod
+    def perimeter(self):
+        pass
+
+class Rectangle(Shape):
+    __slots__ = ("width", "height")
+    fields = ("Width", "Height")
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+    def area(self):
+        return self.width * self.height
+    def perimeter(self):
+        return 2 * (self.width + self.height)
+class Circle(Shape):
+    __slots__ = ("radius",)
+    fields = ("Radius",)
+    def __init__(self, radius):
+        self.radius = radius
+    def area(self):
+        return math.pi * self.radius ** 2
+    def perimeter(self):
+        return 2 * math.pi * self.radius
+class Triangle(Shape):
+    __slots__ = ("side1", "side2", "side3")
+    fields = ("Side 1", "Side 2", "Side 3")
+    def __init__(self, side1, side2, side3):
+        self.side1 = side1
+        self.side2 = side2
+        self.side3 = side3
+    def area(self):
+        s = (self.side1 + self.side2 + self.side3) / 2
+        return math.sqrt(s * (s - self.side1) * (s - self.side2) * (s - self.side3))
+    def perimeter(self):
+        return self.side1 + self.side2 + self.side3
+
+# Shape kinds of the batch file formats, by name; their order gives the kind
+# codes, so new shapes go in the registry rather than here.
+# Each class's __slots__ lists its parameters in order
+SHAPES = {
+    "rectangle": Rectangle,
+    "circle": Circle,
+    "triangle": Triangle,
+}
+
+def form_shapes():
+    """Registered shapes entered as a form of numbers, by name."""
+    return {name: cls for name, cls in REGISTRY.items() if cls.fields}
+
+def load_plugins(modules=None):
+    """Import shape plugin modules so their Shape subclasses register.
+
+    ``modules`` defaults to the comma-separated RYUU_SHAPE_PLUGINS variable.
+    """
+    if modules is None:
+        modules = os.environ.get("RYUU_SHAPE_PLUGINS", "").split(",")
+    for module in modules:
+        if module.strip():
+            importlib.import_module(module.strip())
+
+# Area and perimeter by shape class and parameters, so a UI that recalculates
+# as fields change never computes the same shape twice
+@lru_cache(maxsize=256)
+def measure(shape_cls, *params):
+    shape = shape_cls(*params)
+    return shape.area(), shape.perimeter()
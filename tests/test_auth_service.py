@@ -0,0 +1,80 @@
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ryuu_core.accounts import AccountModel
+from ryuu_core.auth_service import AuthClient, AuthService, main, remove_stale_socket
+
+
+@pytest.fixture
+def service(tmp_path):
+    address = f"unix:{tmp_path / 'auth.sock'}"
+    service = AuthService(AccountModel(str(tmp_path / "users.json")), workers=2)
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(service.serve(address))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not os.path.exists(address[len("unix:"):]):
+        assert thread.is_alive() and time.monotonic() < deadline
+        time.sleep(0.01)
+    yield address
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join()
+    loop.close()
+
+
+def test_signup_and_login(service):
+    client = AuthClient(service)
+    try:
+        assert client.request("signup", "ann", "secret") == (True, "User created successfully")
+        assert client.request("signup", "ann", "other") == (False, "Username already exists")
+        assert client.request("login", "ann", "secret")[0]
+        assert not client.request("login", "ann", "other")[0]
+    finally:
+        client.close()
+
+
+def test_serve_keeps_a_live_socket(service, tmp_path, capsys):
+    path = service[len("unix:"):]
+    with pytest.raises(OSError):
+        remove_stale_socket(path)
+    with pytest.raises(SystemExit) as exit_info:
+        main(["serve", "--address", service, "--file", str(tmp_path / "other.json")])
+    assert exit_info.value.code == 1
+    assert "Another service is listening" in capsys.readouterr().err
+    # The running service still answers
+    client = AuthClient(service)
+    try:
+        assert client.request("admin_login", "admin", "admin104")[0]
+    finally:
+        client.close()
+
+
+def test_stale_socket_is_removed(tmp_path):
+    path = str(tmp_path / "auth.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.close()
+    remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+    other = tmp_path / "notes.txt"
+    other.write_text("keep")
+    remove_stale_socket(str(other))
+    assert other.read_text() == "keep"
@@ -0,0 +1,123 @@
+import os
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ryuu_core.calculator import ARITHMETICS, CalculatorState, ExpressionError, compile_expression, evaluate, tokenize
+
+
+def test_tokenize():
+    assert tokenize("12.5 * (x - .5)") == [
+        ("num", 12.5), ("op", "×"), ("op", "("), ("name", "x"),
+        ("op", "−"), ("num", 0.5), ("op", ")"),
+    ]
+
+
+def test_tokenize_rejects_unknown_characters():
+    with pytest.raises(ExpressionError):
+        tokenize("2 % 3")
+
+
+@pytest.mark.parametrize("text, value", [
+    ("1 + 2 × 3", 7),
+    ("(1 + 2) × 3", 9),
+    ("10 − 4 − 3", 3),
+    ("24 ÷ 4 ÷ 2", 3),
+    ("2 × 3 + 4 × 5", 26),
+    ("8 / 2 * 3", 12),
+    ("((2))", 2),
+])
+def test_precedence_and_associativity(text, value):
+    assert evaluate(text) == value
+
+
+@pytest.mark.parametrize("text, value", [
+    ("-3", -3),
+    ("−3 + 5", 2),
+    ("2 × -3", -6),
+    ("-(2 + 3) × 2", -10),
+    ("--4", 4),
+    ("+4", 4),
+    ("5 - -2", 7),
+])
+def test_unary_minus(text, value):
+    assert evaluate(text) == value
+
+
+@pytest.mark.parametrize("text", [
+    "", "1 +", "× 2", "(1 + 2", "1 + 2)", "()", "2 (3)", "2 3", "x y",
+])
+def test_syntax_errors(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_variables():
+    expression = compile_expression("price × (1 + rate)")
+    assert expression.names == {"price", "rate"}
+    assert expression.evaluate({"price": 100, "rate": 0.5}) == 150
+    assert expression.evaluate({"price": 10, "rate": 1}) == 20
+
+
+def test_missing_variable():
+    with pytest.raises(ExpressionError, match="rate"):
+        evaluate("price × rate", {"price": 1})
+    with pytest.raises(ExpressionError):
+        evaluate("price")
+
+
+def test_division_by_zero_gives_error():
+    assert evaluate("1 ÷ 0") == "Error"
+    assert evaluate("1 + 2 ÷ (3 − 3)") == "Error"
+    assert evaluate("x ÷ y", {"x": 1, "y": 0}) == "Error"
+
+
+def test_compiled_expressions_are_cached():
+    text = "7 × (6 − 1) + 12 ÷ 4"
+    first = compile_expression(text)
+    before = compile_expression.cache_info().hits
+    assert compile_expression(text) is first
+    assert compile_expression.cache_info().hits == before + 1
+    # Evaluating again reuses the code and gives the same answer
+    assert first.evaluate() == first.evaluate() == 38
+
+
+@pytest.mark.parametrize("name", ["decimal", "fraction"])
+def test_exact_results(name):
+    state = CalculatorState(ARITHMETICS[name])
+    state.feed("0.1+0.2=")
+    assert state.display == "0.3"
+    state.feed("C99999999999999999+1=")
+    assert state.display == "100000000000000000"
+    state.feed("C10÷4=")
+    assert state.display == "2.5"
+
+
+@pytest.mark.parametrize("name", ["decimal", "fraction"])
+def test_exact_results_past_int_str_limit(name):
+    # Python refuses int/str conversions past 4300 digits by default
+    state = CalculatorState(ARITHMETICS[name])
+    state.feed("9" * 5000 + "+1=")
+    assert state.display == "1" + "0" * 5000
+    # Ten squarings: 8192 digits
+    state.feed("C99999999" + "×=" * 10)
+    assert state.display == format(Decimal(99999999 ** 1024), "f")
+    assert ARITHMETICS[name].format(ARITHMETICS[name].coerce(Fraction(1, 4))) == "0.25"
+
+
+@pytest.mark.parametrize("name", ARITHMETICS)
+def test_unary_minus_keeps_backend_precision(name):
+    arithmetic = ARITHMETICS[name]
+    assert evaluate("-(1 ÷ 3)", arithmetic=arithmetic) == evaluate("0 − 1 ÷ 3", arithmetic=arithmetic)
+    assert evaluate("-(2 × 3)", arithmetic=arithmetic) == -6
+
+
+def test_unary_minus_decimal_digits():
+    result = evaluate("-(1 ÷ 3)", arithmetic=ARITHMETICS["decimal"])
+    assert str(result) == "-0." + "3" * 34
+    assert evaluate("-(1 ÷ 3)", arithmetic=ARITHMETICS["fraction"]) == Fraction(-1, 3)
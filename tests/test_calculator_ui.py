@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication
+
+from launcher import load_script
+
+
+@pytest.fixture(scope="module")
+def calculator(qapp):
+    window = load_script("Calculator_Ryuu.py").CalculatorUI()
+    window.show()
+    yield window
+    window.close()
+
+
+def wait_for_statistics(calculator):
+    while calculator.stats is not None:
+        QCoreApplication.processEvents()
+
+
+def test_statistics_cancelled_by_a_digit(calculator):
+    calculator.clear_pressed()
+    calculator.paste("\n".join(["1,234.50", "2,000.00"] * 100_000))
+    calculator.statistics_step()
+    assert calculator.stats is not None
+    calculator.buttons["7"].click()
+    calculator.flush_input()
+    assert calculator.stats is None
+    assert calculator.display.text() == "7"
+    assert calculator.expr_label.text() == ""
+    calculator.clear_pressed()
+
+
+def test_statistics_thousands_separators(calculator):
+    calculator.clear_pressed()
+    calculator.paste("Amount\n1,234.50\n2,000.00\n")
+    wait_for_statistics(calculator)
+    assert calculator.display.text() == "3234.5"
+    assert calculator.expr_label.text().startswith("n 2 ·")
+    calculator.clear_pressed()
+
+
+@pytest.mark.parametrize("name", ["float", "decimal", "fraction"])
+def test_statistics_sum_out_of_range(calculator, name):
+    calculator.select_arithmetic(name)
+    try:
+        calculator.clear_pressed()
+        calculator.paste("1e308\n1e308\n")
+        wait_for_statistics(calculator)
+        if name == "fraction":
+            # No exact value for an infinite sum
+            assert calculator.expr_label.text() == "Error: Sum out of range"
+        else:
+            assert calculator.display.text() in ("inf", "Infinity")
+            assert calculator.expr_label.text().startswith("n 2 · mean 1e+308 ·")
+    finally:
+        calculator.select_arithmetic("float")
+        calculator.clear_pressed()
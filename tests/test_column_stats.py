@@ -0,0 +1,115 @@
+import io
+import math
+import os
+import statistics
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ryuu_core.column_stats import SAMPLE_SIZE, ColumnStats, is_number_column, read_stats, stats_main
+
+
+def test_summary_matches_statistics():
+    values = [3.5, -2, 10, 7.25, 0, 1e-3, 42]
+    stats = ColumnStats()
+    stats.feed(" ".join(map(str, values)))
+    stats.finish()
+    assert stats.count == len(values)
+    assert stats.sum == pytest.approx(math.fsum(values))
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert (stats.min, stats.max) == (-2, 42)
+    assert stats.median == statistics.median(values)
+    assert stats.median_is_exact
+
+
+def test_number_split_across_chunks():
+    stats = ColumnStats()
+    for chunk in ["12", "3.4", "5 6", "7\n", "8"]:
+        stats.feed(chunk)
+    stats.finish()
+    assert stats.count == 3
+    assert stats.sum == 123.45 + 67 + 8
+
+
+def test_skips_words_and_non_finite_tokens():
+    stats = ColumnStats()
+    stats.feed("Amount; 1, 2;nan inf −3")
+    stats.finish()
+    assert stats.count == 3
+    assert stats.skipped == 3
+    assert stats.sum == 0
+
+
+def test_thousands_separators_in_a_column():
+    text = "Amount\n1,234.50\n2,000.00\n−1,000\n"
+    assert is_number_column(text)
+    stats = read_stats(io.StringIO(text))
+    assert stats.count == 3
+    assert stats.sum == 2234.5
+    assert stats.skipped == 1
+
+    # Outside a column, commas separate numbers
+    stats = ColumnStats()
+    stats.feed("1,234.50")
+    stats.finish()
+    assert stats.count == 2
+
+
+def test_median_is_sampled_past_the_sample_size():
+    stats = ColumnStats()
+    stats.update([str(value) for value in range(4 * SAMPLE_SIZE + 1)])
+    assert not stats.median_is_exact
+    assert stats.median == pytest.approx(2 * SAMPLE_SIZE, rel=0.05)
+
+
+def test_sum_past_the_float_range_saturates():
+    stats = ColumnStats()
+    stats.update(["1e308", "1e308"])
+    assert stats.sum == math.inf
+    assert stats.mean == 1e308
+    assert stats.variance == 0
+    assert stats.median == 1e308
+    stats.update(["5"])
+    assert stats.sum == math.inf
+
+    stats = ColumnStats()
+    stats.update(["-1e308"])
+    stats.update(["-1e308"])
+    assert stats.sum == -math.inf
+    assert stats.mean == -1e308
+
+
+def test_partial_sum_past_the_float_range():
+    # The total is in range even though adding in order overflows
+    stats = ColumnStats()
+    stats.update(["1e308", "1e308", "-1e308", "-1e308", "5"])
+    assert stats.sum == 5
+    assert stats.mean == 1
+
+
+def test_stats_main(tmp_path, capsys):
+    source = tmp_path / "column.txt"
+    source.write_text("Amount\n1,000\n2,000\n")
+    assert stats_main(["--stats", str(source)]) == 0
+    lines = dict(line.split(",", 1) for line in capsys.readouterr().out.splitlines())
+    assert lines["count"] == "2"
+    assert float(lines["sum"]) == 3000
+    assert lines["skipped"] == "1"
+
+    source.write_text("1e308\n1e308\n")
+    assert stats_main(["--stats", str(source)]) == 0
+    assert "sum,inf" in capsys.readouterr().out.splitlines()
+
+
+def test_stats_main_errors(tmp_path, capsys):
+    assert stats_main(["--stats", str(tmp_path / "nope.txt")]) == 1
+    assert "No such file or directory" in capsys.readouterr().err
+    binary = tmp_path / "data.bin"
+    binary.write_bytes(b"\xff\xfe\x00\x81" * 16)
+    assert stats_main(["--stats", str(binary)]) == 1
+    assert capsys.readouterr().err == "error: not a text file\n"
+    assert stats_main(["--stats", "a", "b"]) == 2
@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ryuu_core.credentials import CredentialStore
+
+APPEND_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from ryuu_core.credentials import CredentialStore
+store = CredentialStore(sys.argv[2], compact_every=10 ** 6)
+for i in range(int(sys.argv[4])):
+    store.add(f"{sys.argv[3]}{i}", password="x", admin=False)
+"""
+
+
+def append_in_subprocess(filename, prefix, count):
+    return subprocess.Popen([sys.executable, "-c", APPEND_SCRIPT, ROOT, filename, prefix, str(count)])
+
+
+def test_journal_replay(tmp_path):
+    filename = str(tmp_path / "users.json")
+    store = CredentialStore(filename)
+    store.put("ann", password="a", admin=False)
+    store.put("bob", password="b", admin=True)
+    store.put("ann", password="c", admin=False)
+    store.delete("bob")
+    assert store.add("ann", password="d") is False
+
+    # A fresh store rebuilds the same index from the journal alone
+    replayed = CredentialStore(filename)
+    assert replayed.get("ann") == {"password": "c", "admin": False}
+    assert "bob" not in replayed
+    assert len(replayed) == 1
+    assert not os.path.exists(filename)
+
+
+def test_journal_ignores_a_partial_line(tmp_path):
+    filename = str(tmp_path / "users.json")
+    CredentialStore(filename).put("ann", password="a")
+    with open(filename + ".log", "ab") as file:
+        file.write(b'{"username":"bob"')
+    store = CredentialStore(filename)
+    assert len(store) == 1
+    with open(filename + ".log", "ab") as file:
+        file.write(b',"password":"b"}\n')
+    assert store.get("bob") == {"password": "b"}
+
+
+def test_compaction(tmp_path):
+    filename = str(tmp_path / "users.json")
+    store = CredentialStore(filename, compact_every=3)
+    for name in ["ann", "bob"]:
+        store.put(name, password=name)
+    assert os.path.getsize(filename + ".log") > 0
+    store.delete("ann")
+
+    # The third line folded the journal into the snapshot
+    assert os.path.getsize(filename + ".log") == 0
+    with open(filename) as file:
+        assert json.load(file) == {"users": {"bob": {"password": "bob"}}}
+    assert CredentialStore(filename).get("bob") == {"password": "bob"}
+
+    store.put("cy", password="c")
+    store.compact()
+    assert os.path.getsize(filename + ".log") == 0
+    assert len(CredentialStore(filename)) == 2
+
+
+def test_legacy_file(tmp_path):
+    filename = str(tmp_path / "users.json")
+    with open(filename, "w") as file:
+        json.dump({"User Login": ["ann", "a"], "Admin Login": ["root", "r"]}, file)
+    store = CredentialStore(filename)
+    assert store.get("ann") == {"password": "a", "admin": False}
+    assert store.get("root") == {"password": "r", "admin": True}
+
+    store.compact()
+    with open(filename) as file:
+        assert "users" in json.load(file)
+    assert len(CredentialStore(filename)) == 2
+
+
+def test_sees_another_process_append(tmp_path):
+    filename = str(tmp_path / "users.json")
+    store = CredentialStore(filename)
+    store.put("ann", password="a")
+    assert "other0" not in store
+
+    assert append_in_subprocess(filename, "other", 1).wait() == 0
+    assert store.get("other0") == {"password": "x", "admin": False}
+    assert len(store) == 2
+
+    # A compaction by the other store replaces the snapshot under this one
+    CredentialStore(filename).compact()
+    store.put("bob", password="b")
+    assert len(CredentialStore(filename)) == len(store) == 3
+
+
+def test_two_processes_append(tmp_path):
+    filename = str(tmp_path / "users.json")
+    count = 300
+    processes = [append_in_subprocess(filename, prefix, count) for prefix in ["a", "b"]]
+    assert [process.wait() for process in processes] == [0, 0]
+
+    with open(filename + ".log", "rb") as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 2 * count
+    for line in lines:
+        json.loads(line)
+    store = CredentialStore(filename)
+    assert len(store) == 2 * count
+    assert all(f"{prefix}{i}" in store for prefix in "ab" for i in range(count))
@@ -0,0 +1,54 @@
+import os
+import socket
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication, QThreadPool
+
+import launcher
+
+
+@pytest.fixture(scope="module")
+def hub(qapp, tmp_path_factory):
+    # Login builds its credential files in the working directory
+    workdir = tmp_path_factory.mktemp("launcher")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(workdir)
+        patch.setattr(launcher, "SERVER_NAME", str(workdir / "hub.sock"))
+        hub = launcher.Launcher()
+        assert hub.listen()
+        for name in launcher.TOOLS:
+            hub.tool_window(name)
+        yield hub
+        for window in hub.windows.values():
+            window.close()
+        hub.server.close()
+        # Login writes its admin account from the pool; let it finish here
+        QThreadPool.globalInstance().waitForDone()
+
+
+def test_requests_in_one_write(hub):
+    windows = [hub.windows["calculator"], hub.windows["shapes"]]
+    for window in windows:
+        window.close()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(launcher.SERVER_NAME)
+        client.sendall(b"calculator\nshapes\n")
+    while not all(window.isVisible() for window in windows):
+        QCoreApplication.processEvents()
+
+
+def test_listen_keeps_live_hub(hub):
+    # A second launch racing the first must not take over its socket
+    other = launcher.Launcher()
+    assert not other.listen()
+    other.server.close()
+    window = hub.windows["calculator"]
+    window.close()
+    assert launcher.send(["calculator"])
+    while not window.isVisible():
+        QCoreApplication.processEvents()
@@ -0,0 +1,34 @@
+"""Importing ryuu_core must never load Qt; batch workers rely on it."""
+import os
+import pkgutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ryuu_core
+MODULES = sorted(f"ryuu_core.{info.name}" for info in pkgutil.iter_modules(ryuu_core.__path__))
+
+# Runs in a fresh interpreter, since this one may already have Qt loaded
+PROBE = """
+import importlib, sys
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+    loaded = sorted(module for module in sys.modules if module.split(".")[0] in ("PySide6", "shiboken6"))
+    if loaded:
+        sys.exit(f"importing {name} loaded {', '.join(loaded)}")
+"""
+
+
+def test_core_modules_found():
+    assert "ryuu_core.calculator" in MODULES
+    assert "ryuu_core.accounts" in MODULES
+    assert "ryuu_core.shapes" in MODULES
+
+
+def test_core_imports_without_qt():
+    result = subprocess.run([sys.executable, "-c", PROBE, *MODULES], cwd=ROOT,
+                            env=dict(os.environ, PYTHONPATH=ROOT),
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ryuu_core.shape_batch import KIND_CODES
+from ryuu_core.shape_stream import main, parse_csv_rows, write_binary
+
+
+def test_parse_csv_rows():
+    codes, params = parse_csv_rows([["rectangle", "3", "4"], ["# note"], [], [" Circle ", "2"]])
+    assert codes.tolist() == [KIND_CODES["rectangle"], KIND_CODES["circle"]]
+    assert params[0, :2].tolist() == [3, 4]
+    assert params[1, 0] == 2
+
+
+@pytest.mark.parametrize("line", ["rectangle,3", "circle,1,2,3", "triangle,3,4"])
+def test_batch_rejects_wrong_parameter_count(line):
+    with pytest.raises(ValueError, match="line 2: .* takes"):
+        parse_csv_rows([["circle", "1"], line.split(",")])
+
+
+def test_batch_csv_and_binary(tmp_path, capsys):
+    source = tmp_path / "shapes.csv"
+    source.write_text("rectangle,3,4\ncircle,1\ntriangle,1,1,5\n")
+    output = tmp_path / "out.csv"
+    assert main(["--batch", str(source), "-o", str(output)]) == 0
+    lines = output.read_text().splitlines()
+    assert lines[0] == "area,perimeter"
+    assert lines[1] == "12,14"
+    assert lines[3].startswith("nan,")
+
+    binary = tmp_path / "shapes.bin"
+    write_binary(binary, np.array([KIND_CODES["rectangle"]]), np.array([[3.0, 4.0, 0.0]]))
+    assert main(["--batch", str(binary), "--chunk-size", "1"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["area,perimeter", "12,14"]
+
+
+def test_batch_missing_input(tmp_path, capsys):
+    output = tmp_path / "out.csv"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--batch", str(tmp_path / "nope.csv"), "-o", str(output)])
+    assert exit_info.value.code == 1
+    assert "No such file or directory" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
+
+
+def test_batch_bad_row_leaves_no_output(tmp_path, capsys):
+    source = tmp_path / "shapes.csv"
+    source.write_text("rectangle,3,4\nrectangle,3\n")
+    output = tmp_path / "out.csv"
+    with pytest.raises(SystemExit):
+        main(["--batch", str(source), "-o", str(output)])
+    assert "line 2" in capsys.readouterr().err
+    assert os.listdir(tmp_path) == ["shapes.csv"]
+
+
+def test_batch_rejects_chunk_size(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--batch", str(tmp_path / "any.csv"), "--chunk-size", "0"])
+    assert exit_info.value.code == 2
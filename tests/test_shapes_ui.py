@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication, Qt
+
+from launcher import load_script
+from ryuu_core.shape_batch import MAX_FIELDS
+from ryuu_core.shape_stream import write_binary
+
+AREA_SECTION = 3
+
+
+def shape_file(path, count):
+    rng = np.random.default_rng(0)
+    write_binary(path, rng.integers(0, 3, count), rng.uniform(1, 10, (count, MAX_FIELDS)))
+    return str(path)
+
+
+@pytest.fixture
+def results(qapp):
+    window = load_script("PySide Shape Calc.py").ResultsWindow()
+    window.show()
+    yield window
+    window.close()
+    window.pool.waitForDone()
+
+
+def wait_for_pool(results):
+    while not results.pool.waitForDone(0):
+        QCoreApplication.processEvents()
+    QCoreApplication.processEvents()
+
+
+def test_sort_in_progress_is_dropped_by_a_new_load(results, tmp_path):
+    results.load(shape_file(tmp_path / "large.bin", 300_000))
+    wait_for_pool(results)
+    assert len(results.table) == 300_000
+
+    # Open another file before the sort's rows arrive
+    results.view.horizontalHeader().setSortIndicator(AREA_SECTION, Qt.SortOrder.AscendingOrder)
+    results.load(shape_file(tmp_path / "small.bin", 10))
+    wait_for_pool(results)
+
+    assert not results.loading
+    assert len(results.table) == 10
+    assert results.model.rows is None
+    assert results.model.available() == results.model.rowCount() == 10
+    assert results.status_label.text() == "small.bin: 10 shapes, 0 invalid"
+
+
+def test_sort_after_load(results, tmp_path):
+    results.load(shape_file(tmp_path / "shapes.bin", 1000))
+    wait_for_pool(results)
+    results.view.horizontalHeader().setSortIndicator(AREA_SECTION, Qt.SortOrder.DescendingOrder)
+    wait_for_pool(results)
+    areas = results.table.areas[results.model.rows]
+    assert len(areas) == 1000
+    assert (np.diff(areas[~np.isnan(areas)]) <= 0).all()
+    assert results.status_label.text() == "1,000 of 1,000 shapes"
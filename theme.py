@@ -0,0 +1,132 @@
+"""Shared theme for the Ryuu apps.
+
+Colours live in cached ``QPalette`` objects, one per theme, applied to the
+whole ``QApplication``. The apps run with the Fusion style, which draws
+everything from the palette; ``eventmonitor.create_application`` asks Qt for
+it before the application exists. No stylesheet is involved, so Qt never parses or
+matches QSS against widgets; switching themes only swaps palettes, which
+repaints widgets without re-polishing them.
+
+Widgets opt into accent colours and fonts with a ``role`` property
+(``normal``, ``op``, ``equal``, ``muted`` or ``display``); ``install_theme``
+gives them the matching cached role palette and font.
+"""
+from functools import lru_cache
+
+from PySide6.QtGui import QColor, QFont, QPalette
+from PySide6.QtWidgets import QApplication, QWidget
+
+DEFAULT_THEME = "dark"
+
+THEMES = {
+    "dark": {
+        "window": "#0f1114",
+        "text": "#e6e6e6",
+        "base": "#17181b",
+        "button": "#1d1f23",
+        "button_text": "#dcdce0",
+        "border": "#2f3136",
+        "highlight": "#b86b3a",
+        "highlight_text": "#ffffff",
+        "accent": "#f39c63",
+        "muted": "#bfbfc6",
+    },
+    "light": {
+        "window": "#f4f4f6",
+        "text": "#1b1d20",
+        "base": "#ffffff",
+        "button": "#e6e7ea",
+        "button_text": "#1b1d20",
+        "border": "#c4c6cc",
+        "highlight": "#d07b45",
+        "highlight_text": "#ffffff",
+        "accent": "#c0602a",
+        "muted": "#5f6068",
+    },
+}
+
+# Palette roles each widget role overrides, as (palette role, theme colour)
+ROLE_COLORS = {
+    "op": [(QPalette.ColorRole.ButtonText, "accent")],
+    "equal": [(QPalette.ColorRole.Button, "highlight"),
+              (QPalette.ColorRole.ButtonText, "highlight_text")],
+    "muted": [(QPalette.ColorRole.WindowText, "muted"),
+              (QPalette.ColorRole.Text, "muted")],
+}
+
+# Font (pixel size, weight) per widget role
+ROLE_FONTS = {
+    "normal": (22, QFont.Weight.Normal),
+    "op": (22, QFont.Weight.DemiBold),
+    "equal": (22, QFont.Weight.Bold),
+    "muted": (16, QFont.Weight.Normal),
+    "display": (48, QFont.Weight.Normal),
+}
+
+
+@lru_cache(maxsize=None)
+def palette(name):
+    colors = {key: QColor(value) for key, value in THEMES[name].items()}
+    result = QPalette()
+    Role = QPalette.ColorRole
+    for role, key in (
+        (Role.Window, "window"), (Role.WindowText, "text"),
+        (Role.Base, "base"), (Role.AlternateBase, "button"), (Role.Text, "text"),
+        (Role.Button, "button"), (Role.ButtonText, "button_text"),
+        (Role.Mid, "border"), (Role.Dark, "border"),
+        (Role.Highlight, "highlight"), (Role.HighlightedText, "highlight_text"),
+        (Role.Link, "accent"), (Role.PlaceholderText, "muted"),
+    ):
+        result.setColor(role, colors[key])
+    return result
+
+
+@lru_cache(maxsize=None)
+def role_palette(name, role):
+    # Only the overridden roles are set, so everything else still follows
+    # the application palette
+    result = QPalette()
+    for palette_role, key in ROLE_COLORS[role]:
+        result.setColor(palette_role, QColor(THEMES[name][key]))
+    return result
+
+
+@lru_cache(maxsize=None)
+def role_font(role):
+    size, weight = ROLE_FONTS[role]
+    font = QFont()
+    font.setPixelSize(size)
+    font.setWeight(weight)
+    return font
+
+
+def current_theme(app=None):
+    app = app or QApplication.instance()
+    return app.property("ryuuTheme")
+
+
+def apply_roles(root, name):
+    for widget in [root, *root.findChildren(QWidget)]:
+        role = widget.property("role")
+        if role in ROLE_COLORS:
+            widget.setPalette(role_palette(name, role))
+        if role in ROLE_FONTS and widget.font() != role_font(role):
+            widget.setFont(role_font(role))
+
+
+def apply_theme(name=DEFAULT_THEME, app=None):
+    """Switch every window of the application to theme ``name``."""
+    app = app or QApplication.instance()
+    app.setPalette(palette(name))
+    for window in app.topLevelWidgets():
+        apply_roles(window, name)
+    app.setProperty("ryuuTheme", name)
+
+
+def install_theme(window):
+    """Theme a newly built window, applying the default theme on first use."""
+    name = current_theme()
+    if name is None:
+        apply_theme()
+    else:
+        apply_roles(window, name)